@@ -3,105 +3,144 @@
 Converts a flat design tokens JSON file to W3C Design Tokens Format Module specification.
 """
 
-import json
+import argparse
 import sys
-import re
-from typing import Any, Dict
+import time
 
-
-def infer_token_type(key: str, value: Any) -> str:
-    """Infer the W3C token type based on key and value."""
-    key_lower = key.lower()
-
-    # Color detection
-    if isinstance(value, str):
-        if re.match(r'^#[0-9A-Fa-f]{3,8}$', value):
-            return "color"
-        if re.match(r'^rgba?\(', value):
-            return "color"
-        if 'color' in key_lower:
-            return "color"
-
-    # Dimension detection
-    if isinstance(value, (int, float)) and any(x in key_lower for x in [
-        'width', 'height', 'size', 'padding', 'margin', 'gap', 'spacing',
-        'radius', 'border', 'offset', 'indent'
-    ]):
-        return "dimension"
-
-    # Font weight
-    if 'weight' in key_lower or 'fontweight' in key_lower:
-        return "fontWeight"
-
-    # Font family
-    if 'font' in key_lower and 'family' in key_lower:
-        return "fontFamily"
-
-    # Duration
-    if 'duration' in key_lower or 'delay' in key_lower:
-        return "duration"
-
-    # Number
-    if isinstance(value, (int, float)):
-        return "number"
-
-    # String/other
-    return "string"
-
-
-def set_nested_value(obj: Dict, path: list, value: Any, original_key: str) -> None:
-    """Set a value in a nested dictionary using a path."""
-    for key in path[:-1]:
-        if key not in obj:
-            obj[key] = {}
-        obj = obj[key]
-
-    last_key = path[-1]
-
-    # Infer type
-    token_type = infer_token_type(original_key, value)
-
-    # Create W3C token structure
-    obj[last_key] = {
-        "$value": value,
-        "$type": token_type
-    }
-
-    # Add description with original flat key for reference
-    obj[last_key]["$description"] = f"Original key: {original_key}"
-
-
-def convert_flat_to_w3c(flat_tokens: Dict) -> Dict:
-    """Convert flat token structure to W3C nested structure."""
-    w3c_tokens = {}
-
-    for flat_key, value in flat_tokens.items():
-        # Split by dots to create hierarchy
-        path = flat_key.split('.')
-        set_nested_value(w3c_tokens, path, value, flat_key)
-
-    return w3c_tokens
+from orbit_tokens.artifact import build_artifact
+from orbit_tokens.batch import SKIPPED, batch_convert, find_themes, print_summary
+from orbit_tokens.incremental import convert_incremental, default_manifest_path, save_manifest
+from orbit_tokens.metrics import Metrics, add_arguments
+from orbit_tokens.overlay import OverlayTheme, convert_merged, convert_overrides, is_overlay
+from orbit_tokens.stream import stream_convert
+from orbit_tokens.w3c import convert_flat_to_w3c, hoist_types, provenance_index, strip_descriptions
 
 
 def main():
-    # Read input file
-    input_file = sys.argv[1] if len(sys.argv) > 1 else "theme-mooneygo.json"
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "theme-mooneygo-w3c.json"
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("input_file", nargs="?", default="theme-mooneygo.json")
+    parser.add_argument("output_file", nargs="?", default="theme-mooneygo-w3c.json")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse the types of unchanged keys from a manifest of the previous run")
+    parser.add_argument("--manifest", help="manifest path (default: <output_file>.manifest.json)")
+    parser.add_argument("--stream", action="store_true",
+                        help="convert pair by pair with bounded memory (for very large themes)")
+    parser.add_argument("--batch", metavar="DIR_OR_GLOB",
+                        help="convert every flat theme in a directory or glob in parallel")
+    parser.add_argument("--out-dir", help="output directory for --batch (default: next to each input)")
+    parser.add_argument("--workers", type=int, help="worker processes for --batch (default: available cores)")
+    parser.add_argument("--merged", action="store_true",
+                        help="for an overlay input, emit the fully merged theme instead of the overrides only")
+    parser.add_argument("--compact", action="store_true",
+                        help="hoist shared $type to groups and drop the per-token descriptions")
+    parser.add_argument("--minify", action="store_true", help="write without indentation or spaces")
+    parser.add_argument("--provenance", metavar="FILE",
+                        help="write the source file and original key order to a side-car index")
+    parser.add_argument("--artifact", metavar="FILE",
+                        help="also write a precompiled resolved-token artifact for runtime lookups")
+    add_arguments(parser)
+    args = parser.parse_args()
+    metrics = Metrics.from_args(args)
+    if args.stream and args.incremental:
+        parser.error("--stream and --incremental cannot be combined")
+    if (args.compact or args.minify) and (args.stream or args.incremental):
+        parser.error("--compact/--minify cannot be combined with --stream or --incremental")
+    if args.artifact and args.stream:
+        parser.error("--artifact cannot be combined with --stream")
+
+    if args.batch:
+        inputs = find_themes(args.batch)
+        if not inputs:
+            parser.error(f"no flat themes found in {args.batch}")
+        print(f"Converting {len(inputs)} files to W3C format...")
+        start = time.perf_counter()
+        try:
+            with metrics.stage('batch'):
+                results = batch_convert(inputs, args.out_dir, args.workers)
+        except ValueError as error:
+            parser.error(str(error))
+        print_summary(results, time.perf_counter() - start)
+        metrics.save(args.metrics)
+        failed = [result for result in results if result[4] and result[4] != SKIPPED]
+        sys.exit(1 if failed else 0)
+
+    input_file = args.input_file
+    output_file = args.output_file
 
     print(f"Converting {input_file} to W3C format...")
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        flat_tokens = json.load(f)
-
-    # Convert to W3C format
-    w3c_tokens = convert_flat_to_w3c(flat_tokens)
-
-    # Write output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(w3c_tokens, f, indent=2, ensure_ascii=False)
-
-    print(f"✓ Conversion complete! Output saved to {output_file}")
+    if args.stream:
+        with metrics.stage('stream'):
+            count, written = stream_convert(input_file, output_file)
+        metrics.count('tokens_visited', count)
+        if written:
+            print(f"✓ Conversion complete! Output saved to {output_file}")
+        else:
+            print(f"✓ Conversion complete! {output_file} is unchanged, not rewritten")
+        print(f"  Total tokens converted: {count}")
+        metrics.save(args.metrics)
+        return
+
+    with metrics.stage('read'):
+        flat_tokens = metrics.read_json(input_file)
+
+    with metrics.stage('convert'):
+        # Overlay themes ($base + $set/$unset) emit only their overrides unless --merged
+        is_overlay_input = is_overlay(flat_tokens)
+        if is_overlay_input:
+            if args.incremental:
+                parser.error("--incremental does not apply to overlay themes")
+            overlay = OverlayTheme.from_data(flat_tokens, input_file)
+            flat_tokens = overlay if args.merged else overlay.overrides
+            w3c_tokens = convert_merged(overlay) if args.merged else convert_overrides(overlay)
+            print(f"  Overlay on {overlay.base_file}: {len(overlay.overrides)} overrides, {len(overlay.removed)} removed")
+
+        # Convert to W3C format
+        elif args.incremental:
+            manifest_file = args.manifest or default_manifest_path(output_file)
+            w3c_tokens, snapshot, stats = convert_incremental(flat_tokens, output_file, manifest_file)
+            if w3c_tokens is None:
+                print(f"✓ {output_file} is up to date")
+                metrics.save(args.metrics)
+                return
+        else:
+            w3c_tokens = convert_flat_to_w3c(flat_tokens, describe=not args.compact)
+    metrics.count('tokens_visited', len(flat_tokens))
+
+    # Built before --compact hoists $type to the groups
+    if args.artifact:
+        with metrics.stage('artifact'):
+            # Hardcoded names of overrides are defined by the merged theme
+            names = overlay if is_overlay_input else flat_tokens
+            artifact_stats = build_artifact([w3c_tokens], args.artifact, flat_theme=names)
+        print(f"  Artifact: {args.artifact} ({artifact_stats['tokens']} tokens, "
+              f"{artifact_stats['bytes'] / 1024:.1f} KB)")
+
+    if args.compact:
+        with metrics.stage('compact'):
+            strip_descriptions(w3c_tokens)
+            w3c_tokens = hoist_types(w3c_tokens)
+
+    # Write output file (skipped when the content is unchanged)
+    with metrics.stage('write'):
+        if args.minify:
+            written = metrics.write_json(output_file, w3c_tokens, indent=None, separators=(',', ':'))
+        else:
+            written = metrics.write_json(output_file, w3c_tokens)
+        if args.provenance:
+            metrics.write_json(args.provenance, provenance_index(input_file, flat_tokens))
+        if args.incremental:
+            save_manifest(manifest_file, snapshot)
+
+    if written:
+        print(f"✓ Conversion complete! Output saved to {output_file}")
+    else:
+        print(f"✓ Conversion complete! {output_file} is unchanged, not rewritten")
     print(f"  Total tokens converted: {len(flat_tokens)}")
+    if args.incremental:
+        mode = "full rebuild" if stats['full'] else "incremental"
+        print(f"  {mode}: {stats['added']} added, {stats['changed']} changed, {stats['removed']} removed")
+    metrics.save(args.metrics)
 
 
 if __name__ == "__main__":
@@ -3,134 +3,80 @@
 Script per convertire tutti gli alias hardcoded nei component tokens
 """
 
-import json
-import re
-
-# Mapping completo alias
-ALIAS_MAP = {
-    # Neutral colors
-    'WHITE': '{global.colors.neutral.white}',
-    'BLACK': '{global.colors.neutral.black}',
-    'TRANSPARENT': '{global.colors.neutral.transparent}',
-
-    # Spacing/Radius (NONE, XS, S, M, L, XL → none, xs, sm, md, lg, xl, 2xl)
-    'NONE': '0',
-    'XS': '{global.radius.xs}',     # 4px radius
-    'S': '{global.radius.sm}',      # 8px radius
-    'M': '{global.radius.md}',      # 10px radius (o spacing md=20px per padding)
-    'L': '{global.radius.lg}',      # 12px radius
-    'XL': '{global.radius.xl}',     # 16px radius
-    'XXL': '{global.radius.2xl}',   # 18px radius
-
-    # Greyscale
-    'GREYSCALE_1': '{global.colors.greyscale.1}',
-    'GREYSCALE_2': '{global.colors.greyscale.2}',
-    'GREYSCALE_3': '{global.colors.greyscale.3}',
-    'GREYSCALE_4': '{global.colors.greyscale.4}',
-    'GREYSCALE_5': '{global.colors.greyscale.5}',
-
-    # Feedback colors
-    'FEEDBACK_ERROR_DARK': '{global.colors.feedback.error.dark}',
-    'FEEDBACK_ERROR_LIGHT': '{global.colors.feedback.error.light}',
-    'FEEDBACK_WARNING_DARK': '{global.colors.feedback.warning.dark}',
-    'FEEDBACK_WARNING_LIGHT': '{global.colors.feedback.warning.light}',
-    'FEEDBACK_SUCCESS_DARK': '{global.colors.feedback.success.dark}',
-    'FEEDBACK_SUCCESS_LIGHT': '{global.colors.feedback.success.light}',
-    'FEEDBACK_INFO_DARK': '{global.colors.feedback.info.dark}',
-    'FEEDBACK_INFO_LIGHT': '{global.colors.feedback.info.light}',
-
-    # MooneyGo specific colors - mappati a semantic (assumendo che esistano)
-    'MOONEYGO_PRIMARY_3': '{semantic.brand.core.main}',
-    'MOONEYGO_SECONDARY_1': '{semantic.brand.alt.light}',
-    'MOONEYGO_SECONDARY_3': '{semantic.brand.core.secondary}',
-    'MOONEYGO_BLUE': '{semantic.brand.core.accent}',
-    'MOONEYGO_GREY1': '{semantic.colors.background.subtle}',
-    'MOONEYGO_GREY2': '{semantic.colors.border.default}',
-    'MOONEYGO_GREY10': '{semantic.colors.text.primary}',
-    'MOONEYGO_EXTRA_COLOR_1_BLUE': '{semantic.colors.background.info}',
-
-    # Backdrop
-    'BACKDROP_COLOR': '{semantic.colors.overlay.backdrop}',
-
-    # Tag status colors
-    'TAG_STATUS_WARNING_DARK': '{global.colors.feedback.warning.dark}',
-    'TAG_STATUS_INFO_DARK': '{global.colors.feedback.info.dark}',
-    'TAG_STATUS_ERROR_DARK': '{global.colors.feedback.error.dark}',
-    'TAG_STATUS_SUCCESS_DARK': '{global.colors.feedback.success.dark}',
-}
-
-def convert_value(value):
-    """Converte un valore usando la mappa alias"""
-    if isinstance(value, str) and value in ALIAS_MAP:
-        return ALIAS_MAP[value]
-    return value
-
-def fix_aliases_recursive(obj, path=''):
-    """Converte ricorsivamente tutti gli alias in un oggetto"""
-    fixes = 0
-
-    if isinstance(obj, dict):
-        if '$value' in obj:
-            old_value = obj['$value']
-            new_value = convert_value(old_value)
-
-            if new_value != old_value:
-                obj['$value'] = new_value
-                fixes += 1
-                print(f"  🔧 {path}: {old_value} → {new_value}")
-
-        # Continua ricorsivamente
-        for key, value in obj.items():
-            if key not in ['$value', '$type', '$description']:
-                fixes += fix_aliases_recursive(value, f'{path}.{key}' if path else key)
-
-    return fixes
-
-# Main execution
-print("📖 Lettura clara-tokens.json...")
-with open('/Users/mattia/Documents/Mattia/Progetti/Mooney/clara-tokens.json', 'r') as f:
-    clara = json.load(f)
-
-components = clara.get('components', {})
-
-print("\n🔧 Conversione alias hardcoded...\n")
-total_fixes = 0
-
-for comp_name in components.keys():
-    print(f"📦 {comp_name}")
-    fixes = fix_aliases_recursive(components[comp_name], comp_name)
-    total_fixes += fixes
-    if fixes == 0:
-        print(f"  ✅ Nessuna conversione necessaria")
-    print()
-
-print(f"✅ Totale conversioni: {total_fixes}")
-
-# Salva
-print("\n💾 Salvataggio clara-tokens.json...")
-with open('/Users/mattia/Documents/Mattia/Progetti/Mooney/clara-tokens.json', 'w') as f:
-    json.dump(clara, f, indent=2, ensure_ascii=False)
-
-print("\n✅ Alias convertiti con successo!")
-
-# Verifica
-print("\n🔍 Verifica alias rimanenti...")
-unconverted = []
-def find_unconverted(obj, path=''):
-    if isinstance(obj, dict):
-        if '$value' in obj:
-            val = obj['$value']
-            if isinstance(val, str) and val.isupper() and not val.startswith('#') and not val.startswith('rgba') and not val.startswith('{'):
-                unconverted.append(f'{path}: {val}')
-        else:
-            for key, value in obj.items():
-                find_unconverted(value, f'{path}.{key}' if path else key)
-
-find_unconverted(components)
-
-if unconverted:
-    print(f"⚠️  {len(unconverted)} alias ancora da convertire:")
-    for item in unconverted[:10]:
-        print(f"  - {item}")
-else:
-    print("✅ Tutti gli alias sono stati convertiti!")
+import argparse
+import os
+
+from orbit_tokens.fixes import AliasFixPass, AutoAliasPass, UnconvertedCheck
+from orbit_tokens.metrics import Metrics, add_arguments
+from orbit_tokens.passes import TokenCounter, walk
+from orbit_tokens.values import alias_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte gli alias hardcoded nei component tokens.")
+    parser.add_argument("clara_file", nargs="?", default="clara-tokens.json")
+    parser.add_argument("--theme", default="theme-mooneygo.json",
+                        help="tema flat che definisce i nomi hardcoded (default: %(default)s)")
+    parser.add_argument("--alias-map", action="store_true",
+                        help="usa solo ALIAS_MAP, senza cercare gli alias per valore")
+    add_arguments(parser)
+    args = parser.parse_args()
+    metrics = Metrics.from_args(args)
+
+    print("📖 Lettura clara-tokens.json...")
+    with metrics.stage('read'):
+        clara = metrics.read_json(args.clara_file)
+        # I nomi del tema servono solo a cercare gli alias per valore
+        theme = None
+        if not args.alias_map and os.path.exists(args.theme):
+            theme = metrics.read_json(args.theme)
+
+    components = clara.get('components', {})
+
+    print("\n🔧 Conversione alias hardcoded...\n")
+
+    # Conversione e verifica nello stesso attraversamento
+    # Alias cercati per valore nei set di clara-tokens.json, ALIAS_MAP come fallback
+    if args.alias_map:
+        alias_pass = AliasFixPass(log=metrics.fix_log())
+    else:
+        alias_pass = AutoAliasPass(alias_index(clara, theme), log=metrics.fix_log())
+    check = UnconvertedCheck()
+    counter = TokenCounter()
+
+    with metrics.stage('fix'):
+        for comp_name in components.keys():
+            print(f"📦 {comp_name}")
+            before = alias_pass.fixes
+            walk(components[comp_name], [alias_pass, check, counter], comp_name)
+            if alias_pass.fixes == before:
+                print(f"  ✅ Nessuna conversione necessaria")
+            print()
+    metrics.count('tokens_visited', counter.visited)
+    metrics.count('fixes', alias_pass.fixes)
+
+    print(f"✅ Totale conversioni: {alias_pass.fixes}")
+
+    # Salva (solo se il contenuto è cambiato)
+    print("\n💾 Salvataggio clara-tokens.json...")
+    with metrics.stage('write'):
+        written = metrics.write_json(args.clara_file, clara)
+
+    print("\n✅ Alias convertiti con successo!" if written else "\n✅ clara-tokens.json invariato, nessuna scrittura")
+
+    # Verifica
+    print("\n🔍 Verifica alias rimanenti...")
+    unconverted = check.unconverted
+
+    if unconverted:
+        print(f"⚠️  {len(unconverted)} alias ancora da convertire:")
+        for item in unconverted[:10]:
+            print(f"  - {item}")
+    else:
+        print("✅ Tutti gli alias sono stati convertiti!")
+
+    metrics.save(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script unico per correggere i component tokens di clara-tokens.json:
+conversione alias, correzione $type e verifica in un solo attraversamento,
+con una sola lettura e una sola scrittura del file.
+"""
+
+import argparse
+import os
+
+from orbit_tokens.fixes import AliasFixPass, AutoAliasPass, TypeFixPass, UnconvertedCheck
+from orbit_tokens.metrics import Metrics, add_arguments
+from orbit_tokens.passes import TokenCounter, walk
+from orbit_tokens.values import alias_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte gli alias e corregge $type in un solo passaggio.")
+    parser.add_argument("clara_file", nargs="?", default="clara-tokens.json")
+    parser.add_argument("--theme", default="theme-mooneygo.json",
+                        help="tema flat che definisce i nomi hardcoded (default: %(default)s)")
+    parser.add_argument("--alias-map", action="store_true",
+                        help="usa solo ALIAS_MAP, senza cercare gli alias per valore")
+    add_arguments(parser)
+    args = parser.parse_args()
+    clara_file = args.clara_file
+    metrics = Metrics.from_args(args)
+
+    print("📖 Lettura clara-tokens.json...")
+    with metrics.stage('read'):
+        clara = metrics.read_json(clara_file)
+        # I nomi del tema servono solo a cercare gli alias per valore
+        theme = None
+        if not args.alias_map and os.path.exists(args.theme):
+            theme = metrics.read_json(args.theme)
+
+    components = clara.get('components', {})
+
+    print("\n🔧 Conversione alias e correzione $type...\n")
+
+    # L'ordine conta: il $type si corregge sull'alias appena convertito
+    fix_log = metrics.fix_log()
+    # Alias cercati per valore nei set di clara-tokens.json, ALIAS_MAP come fallback
+    if args.alias_map:
+        alias_pass = AliasFixPass(log=fix_log)
+    else:
+        alias_pass = AutoAliasPass(alias_index(clara, theme), log=fix_log)
+    type_pass = TypeFixPass(log=fix_log)
+    check = UnconvertedCheck()
+    counter = TokenCounter()
+    passes = [alias_pass, type_pass, check, counter]
+
+    with metrics.stage('fix'):
+        for comp_name in components.keys():
+            print(f"📦 {comp_name}")
+            before = alias_pass.fixes + type_pass.fixes
+            walk(components[comp_name], passes, comp_name)
+            if alias_pass.fixes + type_pass.fixes == before:
+                print(f"  ✅ Nessuna correzione necessaria")
+            print()
+    metrics.count('tokens_visited', counter.visited)
+    metrics.count('fixes', alias_pass.fixes + type_pass.fixes)
+
+    print(f"✅ Totale conversioni alias: {alias_pass.fixes}")
+    print(f"✅ Totale correzioni $type: {type_pass.fixes}")
+
+    # Salva (solo se il contenuto è cambiato)
+    print("\n💾 Salvataggio clara-tokens.json...")
+    with metrics.stage('write'):
+        if not metrics.write_json(clara_file, clara):
+            print("  clara-tokens.json invariato, nessuna scrittura")
+
+    # Verifica
+    print("\n🔍 Verifica alias rimanenti...")
+    if check.unconverted:
+        print(f"⚠️  {len(check.unconverted)} alias ancora da convertire:")
+        for item in check.unconverted[:10]:
+            print(f"  - {item}")
+    else:
+        print("✅ Tutti gli alias sono stati convertiti!")
+
+    metrics.save(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Shared building blocks for the staging-tokens scripts.
+
+The public names below are importable from the package directly
+(`from orbit_tokens import convert_flat_to_w3c`); their modules are only
+imported on first access, so importing the package costs nothing until a
+function is actually used.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'Pipeline': 'pipeline',
+    'run_pipeline': 'pipeline',
+    'COMPONENTS_MAP': 'components',
+    'extract_components': 'components',
+    'import_components': 'components',
+    'convert_flat_to_w3c': 'w3c',
+    'fix_aliases_recursive': 'fixes',
+    'fix_types_by_alias': 'fixes',
+    'find_unconverted': 'fixes',
+    'walk': 'passes',
+    'run_passes': 'passes',
+    'resolve_tokens': 'resolve',
+    'TokenGraph': 'resolve',
+    'BrandTable': 'brands',
+    'OverlayTheme': 'overlay',
+    'TokenArtifact': 'artifact',
+    'build_artifact': 'artifact',
+    'batch_convert': 'batch',
+    'stream_convert': 'stream',
+    'write_json_atomic': 'files',
+    'write_json_if_changed': 'files',
+    'Metrics': 'metrics',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Precompiled token artifact: flat, fully resolved, per-brand, memory-mappable.
+
+Built from W3C trees (as produced by convert_flat_to_w3c, or the
+template/orbit-audit files), the artifact answers "value of token P for
+brand B" with a single mmap and O(1) lookups, without parsing JSON or
+walking alias chains at runtime.
+
+Layout (little-endian, all offsets from the start of the file):
+
+    header   HEADER: magic b'OTKA', version, brand count, token count,
+             bucket count (power of two), then offset and size of every
+             section below
+    brands   brand count × (string offset u32, string length u32)
+    index    bucket count × u32: record number + 1, 0 for an empty bucket
+             (open addressing, linear probing)
+    records  token count × RECORD, each followed by brand count × CELL
+    strings  UTF-8 string table, each distinct string stored once
+
+A record holds the 64-bit hash of the token path (the first 8 bytes of
+BLAKE2b, little-endian), the path and its $type as string references.
+A cell holds the value of one brand: a tag (missing, string, JSON) and a
+string reference. Plain strings (colors, fonts...) are stored raw, and
+other values as compact JSON.
+
+Flat themes hold hardcoded names (UIButton...backgroundColor =
+"MOONEYGO_PRIMARY_3") rather than aliases. When the flat theme is given,
+those names are resolved through its colors.*, spacings.* and borderRadii.*
+sections, trying first the sections of the token kind as alias discovery
+does.
+
+    python -m orbit_tokens.artifact build tokens.otk ../orbit-audit.json
+    python -m orbit_tokens.artifact get tokens.otk semantic.brand.primary.main --brand mooney
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .brands import BrandTable
+from .files import atomic_output
+from .values import NAME_SECTIONS, THEME_NAME, ValueIndex, token_kind
+from .w3c import convert_flat_to_w3c, expand_types, is_flat_theme
+
+MAGIC = b'OTKA'
+VERSION = 1
+
+# magic, version, reserved, brands, tokens, buckets,
+# brands offset, index offset, records offset, strings offset, strings size
+HEADER = struct.Struct('<4sHHIIIIIIII')
+STRING_REF = struct.Struct('<II')
+RECORD = struct.Struct('<QIIII')  # hash, path offset, path length, type offset, type length
+CELL = struct.Struct('<BxxxII')  # tag, value offset, value length
+BUCKET = struct.Struct('<I')
+
+TAG_MISSING = 0
+TAG_STRING = 1
+TAG_JSON = 2
+
+DEFAULT_BRAND = 'default'
+
+
+def path_hash(path: str) -> int:
+    return int.from_bytes(hashlib.blake2b(path.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class _StringTable:
+    """Deduplicated UTF-8 blob."""
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets: Dict[bytes, int] = {}
+
+    def add(self, text: str) -> Tuple[int, int]:
+        data = text.encode('utf-8')
+        offset = self.offsets.get(data)
+        if offset is None:
+            offset = self.offsets[data] = len(self.blob)
+            self.blob += data
+        return offset, len(data)
+
+
+def _encode_cell(strings: _StringTable, value: Any) -> bytes:
+    if value is None:
+        return CELL.pack(TAG_MISSING, 0, 0)
+    if isinstance(value, str):
+        return CELL.pack(TAG_STRING, *strings.add(value))
+    return CELL.pack(TAG_JSON, *strings.add(json.dumps(value, separators=(',', ':'), ensure_ascii=False)))
+
+
+def resolve_theme_names(table: BrandTable, resolved: Dict[str, List[Any]], flat_theme: Dict[str, Any]) -> int:
+    """
+    Replace, in place, resolved values that are hardcoded names of
+    `flat_theme` (GREYSCALE_3) by the value the theme gives them. Return
+    the number of cells replaced.
+    """
+    names = ValueIndex()
+    names.add_theme_names(flat_theme)
+    replaced = 0
+    for i, path in enumerate(table.paths):
+        # The kind of the token first; names unique to another section still resolve
+        kind = token_kind(path.rsplit('.', 1)[-1], table.types[i])
+        kinds = [kind] + [other for other in NAME_SECTIONS if other != kind]
+        for column in resolved.values():
+            value = column[i]
+            seen = set()
+            # A palette entry may itself name another entry
+            while isinstance(value, str) and THEME_NAME.fullmatch(value) and value not in seen:
+                seen.add(value)
+                literal = next((found for found in (names.lookup_name(value, k) for k in kinds)
+                                if found is not None), None)
+                if literal is None:
+                    break
+                value = literal
+            if value is not column[i]:
+                column[i] = value
+                replaced += 1
+    return replaced
+
+
+def build_artifact(trees: Sequence[Dict], output_file: str, brands: Optional[List[str]] = None,
+                   flat_theme: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """
+    Resolve every token of `trees` for every brand and write the artifact.
+    Trees without per-brand $value maps are stored under a single
+    "default" brand. With `flat_theme`, hardcoded theme names are resolved
+    too. Return {'tokens', 'brands', 'bytes', 'collisions'}, the last being
+    the paths defined by more than one tree (the last definition is kept).
+    """
+    table = BrandTable.from_trees(*trees, brands=brands)
+    if not table.brands:
+        table.add_brand(DEFAULT_BRAND)
+    resolved = table.resolve()
+    if flat_theme is not None:
+        resolve_theme_names(table, resolved, flat_theme)
+
+    n_tokens = len(table.paths)
+    n_brands = len(table.brands)
+    n_buckets = 1
+    while n_buckets < 2 * max(n_tokens, 1):
+        n_buckets <<= 1
+
+    strings = _StringTable()
+    brand_refs = b''.join(STRING_REF.pack(*strings.add(brand)) for brand in table.brands)
+
+    buckets = [0] * n_buckets
+    records = bytearray()
+    columns = [resolved[brand] for brand in table.brands]
+    for i, path in enumerate(table.paths):
+        token_hash = path_hash(path)
+        slot = token_hash & (n_buckets - 1)
+        while buckets[slot]:
+            slot = (slot + 1) & (n_buckets - 1)
+        buckets[slot] = i + 1
+
+        records += RECORD.pack(token_hash, *strings.add(path), *strings.add(table.types[i] or ''))
+        for column in columns:
+            records += _encode_cell(strings, column[i])
+
+    brands_offset = HEADER.size
+    index_offset = brands_offset + len(brand_refs)
+    records_offset = index_offset + n_buckets * BUCKET.size
+    strings_offset = records_offset + len(records)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, n_brands, n_tokens, n_buckets,
+        brands_offset, index_offset, records_offset, strings_offset, len(strings.blob),
+    )
+    with atomic_output(output_file, binary=True) as f:
+        f.write(header)
+        f.write(brand_refs)
+        f.write(struct.pack(f'<{n_buckets}I', *buckets))
+        f.write(records)
+        f.write(strings.blob)
+
+    return {'tokens': n_tokens, 'brands': n_brands, 'bytes': strings_offset + len(strings.blob),
+            'collisions': table.graph.collisions}
+
+
+class TokenArtifact:
+    """Read-only, memory-mapped view of an artifact."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.n_brands, self.n_tokens, self.n_buckets, brands_offset,
+         self._index, self._records, self._strings, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} token artifact")
+        self._record_size = RECORD.size + self.n_brands * CELL.size
+        self.brands: List[str] = [
+            self._string(*STRING_REF.unpack_from(self._map, brands_offset + b * STRING_REF.size))
+            for b in range(self.n_brands)
+        ]
+        self._brand_ids = {brand: b for b, brand in enumerate(self.brands)}
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _find(self, path: str) -> int:
+        """Byte offset of the record of `path`, or -1."""
+        token_hash = path_hash(path)
+        key = path.encode('utf-8')
+        mask = self.n_buckets - 1
+        slot = token_hash & mask
+        while True:
+            entry = BUCKET.unpack_from(self._map, self._index + slot * BUCKET.size)[0]
+            if not entry:
+                return -1
+            record = self._records + (entry - 1) * self._record_size
+            stored_hash, offset, length, _, _ = RECORD.unpack_from(self._map, record)
+            if stored_hash == token_hash:
+                start = self._strings + offset
+                if self._map[start:start + length] == key:
+                    return record
+            slot = (slot + 1) & mask
+
+    def _cell(self, record: int, brand: Optional[str]) -> Any:
+        b = 0 if brand is None else self._brand_ids[brand]
+        tag, offset, length = CELL.unpack_from(self._map, record + RECORD.size + b * CELL.size)
+        if tag == TAG_MISSING:
+            return None
+        text = self._string(offset, length)
+        return text if tag == TAG_STRING else json.loads(text)
+
+    def get(self, path: str, brand: Optional[str] = None, default: Any = None) -> Any:
+        """Resolved value of `path` for `brand` (the first brand when None)."""
+        record = self._find(path)
+        if record < 0:
+            return default
+        value = self._cell(record, brand)
+        return default if value is None else value
+
+    def type(self, path: str) -> Optional[str]:
+        record = self._find(path)
+        if record < 0:
+            return None
+        _, _, _, offset, length = RECORD.unpack_from(self._map, record)
+        return self._string(offset, length) or None
+
+    def values(self, path: str) -> Dict[str, Any]:
+        """{brand: value} of one token."""
+        record = self._find(path)
+        if record < 0:
+            raise KeyError(path)
+        return {brand: self._cell(record, brand) for brand in self.brands}
+
+    def __contains__(self, path: str) -> bool:
+        return self._find(path) >= 0
+
+    def __len__(self) -> int:
+        return self.n_tokens
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self.n_tokens):
+            _, offset, length, _, _ = RECORD.unpack_from(self._map, self._records + i * self._record_size)
+            yield self._string(offset, length)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> 'TokenArtifact':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_trees(files: Sequence[str]) -> Tuple[List[Dict], Optional[Dict[str, Any]]]:
+    """
+    Return (trees, flat theme): W3C trees from files, with group $type
+    copied onto the tokens. Flat themes are converted with
+    convert_flat_to_w3c first, and their keys merged into the flat theme
+    used to resolve hardcoded names (None when there is none).
+    """
+    trees = []
+    flat_theme = None
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        if is_flat_theme(document):
+            flat_theme = {**(flat_theme or {}), **document}
+            document = convert_flat_to_w3c(document, describe=False)
+        else:
+            expand_types(document)
+        trees.append(document)
+    return trees, flat_theme
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a precompiled resolved-token artifact.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="resolve W3C files (or flat themes) into an artifact")
+    build.add_argument("output_file")
+    build.add_argument("input_files", nargs="+")
+    build.add_argument("--brands", help="comma-separated brands (default: those of the $value maps)")
+
+    get = commands.add_parser("get", help="look up tokens in an artifact")
+    get.add_argument("artifact_file")
+    get.add_argument("paths", nargs="+")
+    get.add_argument("--brand", help="brand to read (default: all)")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        brands = args.brands.split(',') if args.brands else None
+        trees, flat_theme = load_trees(args.input_files)
+        stats = build_artifact(trees, args.output_file, brands, flat_theme)
+        for path, owners in stats['collisions'].items():
+            files = ', '.join(args.input_files[index] for index in owners)
+            print(f"⚠️  {path}: defined in {files} (the last one wins)")
+        print(f"✓ {args.output_file}: {stats['tokens']} tokens × {stats['brands']} brands, "
+              f"{stats['bytes'] / 1024:.1f} KB")
+        return
+
+    with TokenArtifact(args.artifact_file) as artifact:
+        if args.brand and args.brand not in artifact.brands:
+            parser.error(f"unknown brand {args.brand} (available: {', '.join(artifact.brands)})")
+        missing = 0
+        for path in args.paths:
+            if path not in artifact:
+                print(f"✗ {path}: not found")
+                missing += 1
+            elif args.brand:
+                print(f"{path} = {json.dumps(artifact.get(path, args.brand), ensure_ascii=False)}")
+            else:
+                print(f"{path} ({artifact.type(path)}) = {json.dumps(artifact.values(path), ensure_ascii=False)}")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
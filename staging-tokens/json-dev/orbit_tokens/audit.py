@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Color audit across every brand: contrast, near-duplicates, out-of-palette values.
+
+All colors are parsed once into a NumPy array of shape (tokens, brands, 4)
+(RGBA in 0..1, NaN where a brand has no color for the token). Luminance,
+contrast ratios and CIELAB distances are then computed on whole arrays:
+
+- contrast: WCAG 2 contrast of foreground/background pairs, per brand.
+  Pairs are siblings named like foreground/background, textColor/
+  backgroundColor... or given explicitly; translucent foregrounds are
+  composited over their background first.
+- near-duplicates: distinct colors of one brand closer than a ΔE threshold
+  (CIE76 in CIELAB, alpha counted as an extra axis), checked pairwise in
+  square blocks of the upper triangle to bound memory.
+- out-of-palette: literal colors outside the palette (global.colors.* in
+  W3C files, colors.* in flat themes), with the nearest palette color.
+
+W3C files audited together must not define the same token paths: the last
+definition would silently replace the others, so such files are rejected.
+
+Requires numpy.
+
+    python -m orbit_tokens.audit ../orbit-audit.json -o audit.json
+    python -m orbit_tokens.audit theme-mooneygo.json --min-contrast 3
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .brands import BrandTable
+from .files import write_json_atomic
+from .values import format_color, parse_color
+from .w3c import is_flat_theme
+
+MIN_CONTRAST = 4.5
+NEAR_DUPLICATE_DELTA_E = 2.0
+# Rows and columns of the pairwise distance matrix computed at once
+BLOCK = 1024
+
+# (foreground, background) name fragments of sibling tokens
+PAIR_NAMES = (
+    ('foreground', 'background'),
+    ('textColor', 'backgroundColor'),
+    ('TextColor', 'BackgroundColor'),
+    ('labelColor', 'backgroundColor'),
+    ('iconColor', 'backgroundColor'),
+    ('text', 'background'),
+)
+
+# sRGB (D65) → XYZ
+_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+class ColorTable:
+    """Token paths × brands matrix of RGBA colors (NaN when absent)."""
+
+    def __init__(self, paths: List[str], brands: List[str], columns: Dict[str, Sequence], palette: Iterable[bool]):
+        self.paths = paths
+        self.brands = brands
+        self.literal = np.zeros((len(paths), len(brands)), dtype=bool)
+        self.rgba = np.full((len(paths), len(brands), 4), np.nan)
+        self.palette = np.fromiter(palette, dtype=bool, count=len(paths))
+
+        # Parse every distinct string once
+        parsed: Dict[str, Optional[int]] = {}
+        for b, brand in enumerate(brands):
+            for i, value in enumerate(columns[brand]):
+                if not isinstance(value, str):
+                    continue
+                if value not in parsed:
+                    parsed[value] = parse_color(value)
+                if parsed[value] is not None:
+                    self.rgba[i, b] = _unpack(parsed[value])
+
+    @classmethod
+    def from_w3c(cls, *trees: Dict, brands: Optional[List[str]] = None) -> 'ColorTable':
+        """
+        Resolved colors of multi-brand W3C trees; the palette is global.colors.*.
+        Raise ValueError when the trees define the same token paths.
+        """
+        table = BrandTable.from_trees(*trees, brands=brands)
+        collisions = table.graph.collisions
+        if collisions:
+            path, owners = next(iter(collisions.items()))
+            raise ValueError(f"{len(collisions)} token paths are defined by more than one file "
+                             f"(e.g. {path} in files {', '.join(str(i + 1) for i in owners)})")
+        resolved = table.resolve()
+        if not table.brands:
+            table.add_brand('default')
+            resolved = table.resolve()
+        colors = cls(
+            table.paths, table.brands, resolved,
+            (path.startswith('global.colors.') for path in table.paths),
+        )
+        for b, brand in enumerate(table.brands):
+            colors.literal[:, b] = np.fromiter(
+                (ref == -1 for ref in table.refs[brand]), dtype=bool, count=len(table.paths)
+            )
+        return colors
+
+    @classmethod
+    def from_flat(cls, flat_tokens: Dict, name: str) -> 'ColorTable':
+        """
+        Colors of a flat theme as a single brand. Hardcoded names
+        (GREYSCALE_3) resolve through the colors.* palette.
+        """
+        palette_names = {key[len('colors.'):]: value for key, value in flat_tokens.items()
+                         if key.startswith('colors.')}
+        paths = list(flat_tokens)
+        values = [palette_names.get(value, value) if isinstance(value, str) else value
+                  for value in flat_tokens.values()]
+        colors = cls(paths, [name], {name: values}, (path.startswith('colors.') for path in paths))
+        colors.literal[:, 0] = [
+            not (isinstance(value, str) and value in palette_names) for value in flat_tokens.values()
+        ]
+        return colors
+
+    @property
+    def present(self) -> np.ndarray:
+        return ~np.isnan(self.rgba[..., 0])
+
+
+def _unpack(rgba: int) -> Tuple[float, float, float, float]:
+    return ((rgba >> 24) & 0xFF) / 255, ((rgba >> 16) & 0xFF) / 255, ((rgba >> 8) & 0xFF) / 255, (rgba & 0xFF) / 255
+
+
+def _pack(rgba: np.ndarray) -> int:
+    r, g, b, a = np.round(rgba * 255).astype(int)
+    return (int(r) << 24) | (int(g) << 16) | (int(b) << 8) | int(a)
+
+
+def linearize(rgb: np.ndarray) -> np.ndarray:
+    """sRGB channels (0..1) to linear light."""
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def luminance(rgb: np.ndarray) -> np.ndarray:
+    """WCAG relative luminance of (..., 3) sRGB arrays."""
+    return linearize(rgb) @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def composite(fg: np.ndarray, bg: np.ndarray) -> np.ndarray:
+    """Alpha-blend (..., 4) foregrounds over backgrounds, backgrounds over white; return (..., 3)."""
+    bg_rgb = bg[..., :3] * bg[..., 3:] + (1 - bg[..., 3:])
+    return fg[..., :3] * fg[..., 3:] + bg_rgb * (1 - fg[..., 3:])
+
+
+def contrast_ratio(fg: np.ndarray, bg: np.ndarray) -> np.ndarray:
+    """WCAG contrast of (..., 4) foreground/background arrays."""
+    bg_rgb = composite(bg, np.ones_like(bg))
+    l1 = luminance(composite(fg, bg))
+    l2 = luminance(bg_rgb)
+    high, low = np.maximum(l1, l2), np.minimum(l1, l2)
+    return (high + 0.05) / (low + 0.05)
+
+
+def to_lab(rgba: np.ndarray) -> np.ndarray:
+    """(..., 4) RGBA → (..., 4) CIELAB with alpha scaled to the L axis (0..100)."""
+    xyz = (linearize(rgba[..., :3]) @ _XYZ.T) / _WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    lab = np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+    return np.concatenate([lab, rgba[..., 3:] * 100], axis=-1)
+
+
+def pairwise_delta_e(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """ΔE (CIE76 + alpha) between every row of `a` and every row of `b` (both (n, 4) Lab+alpha)."""
+    diff = a[:, None, :] - b[None, :, :]
+    return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+
+def find_pairs(paths: Sequence[str]) -> List[Tuple[int, int]]:
+    """(foreground index, background index) of sibling tokens named as a pair."""
+    position = {path: i for i, path in enumerate(paths)}
+    pairs = []
+    for i, path in enumerate(paths):
+        parent, _, name = path.rpartition('.')
+        for fg_name, bg_name in PAIR_NAMES:
+            if fg_name in name:
+                sibling = (parent + '.' if parent else '') + name.replace(fg_name, bg_name, 1)
+                j = position.get(sibling)
+                if j is not None and j != i:
+                    pairs.append((i, j))
+                    break
+    return pairs
+
+
+def audit_contrast(colors: ColorTable, pairs: Sequence[Tuple[int, int]], min_contrast: float) -> List[Dict]:
+    """Pairs below `min_contrast`, for every brand at once."""
+    if not pairs:
+        return []
+    index = np.array(pairs)
+    fg = colors.rgba[index[:, 0]]
+    bg = colors.rgba[index[:, 1]]
+    ratios = contrast_ratio(fg, bg)  # (pairs, brands), NaN where a color is missing
+    failing = np.argwhere(ratios < min_contrast)
+    return [
+        {
+            'brand': colors.brands[b],
+            'foreground': colors.paths[pairs[p][0]],
+            'background': colors.paths[pairs[p][1]],
+            'colors': [format_color(_pack(fg[p, b])), format_color(_pack(bg[p, b]))],
+            'contrast': round(float(ratios[p, b]), 2),
+        }
+        for p, b in failing
+    ]
+
+
+def near_duplicates(colors: ColorTable, threshold: float, block: int = BLOCK) -> List[Dict]:
+    """Distinct colors of the same brand closer than `threshold` ΔE."""
+    results = []
+    for b, brand in enumerate(colors.brands):
+        present = colors.present[:, b]
+        packed = np.round(colors.rgba[present, b] * 255).astype(np.int64)
+        keys = (packed[:, 0] << 24) | (packed[:, 1] << 16) | (packed[:, 2] << 8) | packed[:, 3]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        if len(unique) < 2:
+            continue
+        rgba = np.stack([(unique >> shift) & 0xFF for shift in (24, 16, 8, 0)], axis=-1) / 255
+        lab = to_lab(rgba)
+        token_ids = np.flatnonzero(present)
+        # Tokens of every unique color: group once instead of scanning per pair
+        by_color = token_ids[np.argsort(inverse, kind='stable')]
+        starts = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(unique)))))
+
+        def members(i):
+            return [colors.paths[t] for t in by_color[starts[i]:min(starts[i + 1], starts[i] + 5)]]
+
+        # Only the upper triangle: column blocks start at the row block
+        for row in range(0, len(unique), block):
+            for col in range(row, len(unique), block):
+                distances = pairwise_delta_e(lab[row:row + block], lab[col:col + block])
+                rows, cols = np.nonzero(distances < threshold)
+                keep = rows + row < cols + col
+                for i, j in zip(rows[keep], cols[keep]):
+                    results.append({
+                        'brand': brand,
+                        'colors': [format_color(int(unique[row + i])), format_color(int(unique[col + j]))],
+                        'delta_e': round(float(distances[i, j]), 2),
+                        'tokens': [members(row + i), members(col + j)],
+                    })
+    results.sort(key=lambda item: item['delta_e'])
+    return results
+
+
+def out_of_palette(colors: ColorTable, tolerance: float = 0.0) -> List[Dict]:
+    """Literal colors outside the palette (ΔE > `tolerance` from every palette color)."""
+    palette = colors.rgba[colors.palette].reshape(-1, 4)
+    palette = np.unique(palette[~np.isnan(palette[:, 0])], axis=0)
+    if not len(palette):
+        return []
+    palette_lab = to_lab(palette)
+
+    candidates = colors.present & colors.literal & ~colors.palette[:, None]
+    token_idx, brand_idx = np.nonzero(candidates)
+    if not len(token_idx):
+        return []
+    distances = np.empty(len(token_idx))
+    nearest = np.empty(len(token_idx), dtype=np.int64)
+    values_lab = to_lab(colors.rgba[token_idx, brand_idx])
+    for start in range(0, len(token_idx), BLOCK):
+        d = pairwise_delta_e(values_lab[start:start + BLOCK], palette_lab)
+        nearest[start:start + BLOCK] = d.argmin(axis=1)
+        distances[start:start + BLOCK] = d.min(axis=1)
+
+    outside = np.flatnonzero(distances > tolerance)
+    return [
+        {
+            'brand': colors.brands[brand_idx[k]],
+            'token': colors.paths[token_idx[k]],
+            'color': format_color(_pack(colors.rgba[token_idx[k], brand_idx[k]])),
+            'nearest': format_color(_pack(palette[nearest[k]])),
+            'delta_e': round(float(distances[k]), 2),
+        }
+        for k in outside
+    ]
+
+
+def audit(colors: ColorTable, pairs: Optional[Sequence[Tuple[int, int]]] = None,
+          min_contrast: float = MIN_CONTRAST, duplicate_delta_e: float = NEAR_DUPLICATE_DELTA_E) -> Dict:
+    """Run the three checks on a ColorTable and return the report."""
+    pairs = find_pairs(colors.paths) if pairs is None else pairs
+    present = colors.present
+    report = {
+        'brands': colors.brands,
+        'tokens': len(colors.paths),
+        'colors': int(present.sum()),
+        'contrast': audit_contrast(colors, pairs, min_contrast),
+        'near_duplicates': near_duplicates(colors, duplicate_delta_e),
+        'out_of_palette': out_of_palette(colors),
+    }
+    report['summary'] = {
+        'pairs': len(pairs),
+        'pair_checks': int(sum((present[fg] & present[bg]).sum() for fg, bg in pairs)),
+        'low_contrast': len(report['contrast']),
+        'near_duplicates': len(report['near_duplicates']),
+        'out_of_palette': len(report['out_of_palette']),
+    }
+    return report
+
+
+def load_colors(files: Sequence[str]) -> ColorTable:
+    """W3C files are audited together (they may reference each other); a flat theme on its own."""
+    documents = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            documents.append(json.load(f))
+    flat = [is_flat_theme(document) for document in documents]
+    if all(flat) and len(documents) == 1:
+        return ColorTable.from_flat(documents[0], os.path.splitext(os.path.basename(files[0]))[0])
+    if any(flat):
+        raise ValueError("Audit flat themes one at a time, and not together with W3C files")
+    return ColorTable.from_w3c(*documents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit colors across brands: contrast, near-duplicates, palette.")
+    parser.add_argument("files", nargs="+", help="W3C token files (audited together) or one flat theme")
+    parser.add_argument("--min-contrast", type=float, default=MIN_CONTRAST, help="default: %(default)s (WCAG AA)")
+    parser.add_argument("--delta-e", type=float, default=NEAR_DUPLICATE_DELTA_E,
+                        help="near-duplicate threshold (default: %(default)s)")
+    parser.add_argument("--pair", nargs=2, action="append", metavar=("FOREGROUND", "BACKGROUND"),
+                        help="token paths to check for contrast (repeatable; default: sibling names)")
+    parser.add_argument("-o", "--output", help="write the full report as JSON")
+    args = parser.parse_args()
+
+    try:
+        colors = load_colors(args.files)
+    except ValueError as error:
+        parser.error(str(error))
+
+    pairs = None
+    if args.pair:
+        position = {path: i for i, path in enumerate(colors.paths)}
+        missing = [path for pair in args.pair for path in pair if path not in position]
+        if missing:
+            parser.error(f"unknown tokens: {', '.join(missing)}")
+        pairs = [(position[fg], position[bg]) for fg, bg in args.pair]
+
+    report = audit(colors, pairs, args.min_contrast, args.delta_e)
+    summary = report['summary']
+    print(f"Audited {report['colors']} colors of {report['tokens']} tokens × {len(report['brands'])} brands "
+          f"({', '.join(report['brands'])})")
+    print(f"  contrast < {args.min_contrast}: {summary['low_contrast']} of {summary['pair_checks']} checks "
+          f"({summary['pairs']} pairs)")
+    for item in report['contrast'][:10]:
+        print(f"    {item['brand']:10} {item['contrast']:5.2f}  {item['foreground']} on {item['background']}")
+    print(f"  near-duplicates (ΔE < {args.delta_e}): {summary['near_duplicates']}")
+    for item in report['near_duplicates'][:10]:
+        print(f"    {item['brand']:10} {item['delta_e']:5.2f}  {item['colors'][0]} ~ {item['colors'][1]}")
+    print(f"  out of palette: {summary['out_of_palette']}")
+    for item in report['out_of_palette'][:10]:
+        print(f"    {item['brand']:10} {item['token']}: {item['color']} (nearest {item['nearest']}, ΔE {item['delta_e']})")
+
+    if args.output:
+        write_json_atomic(args.output, report)
+        print(f"✓ Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
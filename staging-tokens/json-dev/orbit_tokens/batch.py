@@ -0,0 +1,121 @@
+"""
+Parallel batch conversion of flat theme files to W3C.
+
+Themes are fanned out over a process pool sized to the available cores; each
+worker parses, converts and atomically writes one theme (not at all when the
+output already holds the same content), so a CI build of many brands pays
+interpreter startup once per worker rather than once per file. Files that are not flat themes (W3C trees found by a directory glob)
+are skipped, and a file that fails is reported without stopping the batch.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .files import write_json_if_changed
+from .overlay import OverlayTheme, is_overlay
+from .w3c import convert_flat_to_w3c, is_flat_theme
+
+W3C_SUFFIX = '-w3c.json'
+SKIPPED = 'skipped: not a flat theme'
+
+# (input file, tokens, bytes written (0 when the output was unchanged), seconds, error or None)
+Result = Tuple[str, int, int, float, Optional[str]]
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def find_themes(source: str) -> List[str]:
+    """Flat theme files in a directory, or matching a glob; W3C outputs are skipped."""
+    pattern = os.path.join(source, '*.json') if os.path.isdir(source) else source
+    return sorted(path for path in glob.glob(pattern) if not path.endswith(W3C_SUFFIX))
+
+
+def output_path(input_file: str, out_dir: Optional[str] = None) -> str:
+    """theme-base.json → theme-base-w3c.json, next to the input or in `out_dir`."""
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    if stem.endswith('.overlay'):
+        stem = stem[:-len('.overlay')]
+    return os.path.join(out_dir or os.path.dirname(input_file), stem + W3C_SUFFIX)
+
+
+def convert_file(input_file: str, output_file: str) -> Result:
+    """
+    Convert one theme; return (input file, tokens, bytes written, seconds,
+    error). An output that already holds the same content is not rewritten
+    (0 bytes written). Overlay themes are converted as their fully merged view; files
+    that are not flat themes are skipped. Errors are returned, not raised,
+    so one bad file does not abort the batch.
+    """
+    start = time.perf_counter()
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            flat_tokens = json.load(f)
+        if is_overlay(flat_tokens):
+            flat_tokens = OverlayTheme.from_data(flat_tokens, input_file)
+        elif not isinstance(flat_tokens, dict) or not is_flat_theme(flat_tokens):
+            return input_file, 0, 0, time.perf_counter() - start, SKIPPED
+        size = write_json_if_changed(output_file, convert_flat_to_w3c(flat_tokens))
+    except Exception as error:
+        return input_file, 0, 0, time.perf_counter() - start, f'{type(error).__name__}: {error}'
+    return input_file, len(flat_tokens), size, time.perf_counter() - start, None
+
+
+def check_outputs(inputs: List[str], outputs: List[str]) -> None:
+    """Raise ValueError when two inputs would be written to the same output."""
+    seen: Dict[str, str] = {}
+    clashes = []
+    for src, dst in zip(inputs, outputs):
+        key = os.path.normcase(os.path.abspath(dst))
+        if key in seen:
+            clashes.append(f"{seen[key]} and {src} → {dst}")
+        else:
+            seen[key] = src
+    if clashes:
+        raise ValueError("Several inputs map to the same output: " + "; ".join(clashes))
+
+
+def batch_convert(inputs: List[str], out_dir: Optional[str] = None, workers: Optional[int] = None) -> List[Result]:
+    """
+    Convert every theme in `inputs` in parallel; results keep the input order.
+    Raise ValueError, before converting anything, if two inputs share an output.
+    """
+    outputs = [output_path(path, out_dir) for path in inputs]
+    check_outputs(inputs, outputs)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    workers = max(1, min(workers or available_cores(), len(inputs)))
+
+    if workers == 1:
+        return [convert_file(src, dst) for src, dst in zip(inputs, outputs)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(convert_file, inputs, outputs))
+
+
+def print_summary(results: List[Result], elapsed: float) -> None:
+    width = max(len(os.path.basename(path)) for path, *_ in results)
+    for path, tokens, size, seconds, error in results:
+        name = os.path.basename(path)
+        if error:
+            mark = '-' if error == SKIPPED else '✗'
+            print(f"  {mark} {name:{width}}  {error}")
+        else:
+            written = f"{size / 1024:9.1f} KB" if size else f"{'unchanged':>12}"
+            print(f"  ✓ {name:{width}}  {tokens:7d} tokens  {written}  {seconds * 1000:8.1f} ms")
+    converted = [result for result in results if result[4] is None]
+    unchanged = sum(1 for result in converted if not result[2])
+    skipped = sum(1 for result in results if result[4] == SKIPPED)
+    failed = len(results) - len(converted) - skipped
+    total = sum(result[1] for result in converted)
+    busy = sum(result[3] for result in results)
+    print(f"  {len(converted)} themes, {total} tokens in {elapsed:.2f}s (sum of per-file time {busy:.2f}s)"
+          f", {unchanged} unchanged, {skipped} skipped, {failed} failed")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the staging-tokens building blocks on synthetic token sets.
+
+For each size (1k to 1M tokens) a flat theme and a W3C token set are
+generated (see synthetic.py), then every case is timed (best of `repeat`
+runs) and run once more under tracemalloc for its peak allocation. Inputs
+that a case mutates are copied before the timer starts.
+
+Results are written as JSON. Thresholds are expressed per token
+(microseconds and peak bytes), so one table gates every size; a previous
+results file can also be given as a baseline to flag slowdowns beyond a
+tolerance. The exit status is 1 when any check fails.
+
+    python -m orbit_tokens.bench --sizes 1000,10000,100000 -o bench.json
+    python -m orbit_tokens.bench --sizes 1000000 --repeat 1 --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .brands import BrandTable
+from .components import extract_component
+from .files import write_json_atomic
+from .fixes import fix_aliases_recursive, fix_types_by_alias
+from .passes import count_tokens
+from .synthetic import BRANDS, generate_flat_theme, generate_token_set
+from .w3c import convert_flat_to_w3c
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Per-token limits, about 3x the figures measured at 1k-100k tokens. The
+# extracted component has a fixed size, so extract_component's per-token
+# peak is highest on the smallest themes.
+DEFAULT_THRESHOLDS: Dict[str, Dict[str, float]] = {
+    'convert_flat_to_w3c': {'us_per_token': 10.0, 'bytes_per_token': 1200},
+    'extract_component': {'us_per_token': 2.5, 'bytes_per_token': 350},
+    'fix_aliases_recursive': {'us_per_token': 5.0, 'bytes_per_token': 100},
+    'fix_types_by_alias': {'us_per_token': 5.0, 'bytes_per_token': 100},
+    'resolve_brands': {'us_per_token': 40.0, 'bytes_per_token': 1600},
+}
+
+
+class Case:
+    """A benchmarked call: `setup` builds fresh arguments, `run` is measured."""
+
+    def __init__(self, name: str, tokens: int, run: Callable, setup: Callable[[], Tuple] = tuple):
+        self.name = name
+        self.tokens = tokens
+        self.run = run
+        self.setup = setup
+
+
+def build_cases(size: int, alias_depth: int = 3, brands=BRANDS, seed: int = 0) -> List[Case]:
+    """Generate the synthetic inputs for `size` tokens and the cases measured on them."""
+    flat = generate_flat_theme(size, seed)
+    token_set = generate_token_set(size, alias_depth, brands, seed)
+    components = token_set['components']
+    component_tokens = count_tokens(components)
+
+    # One component in the middle of the theme: extract_component scans every key
+    middle = list(flat)[len(flat) // 2]
+    prefix = middle.split('.', 1)[0] + '.'
+
+    # fix-types-by-alias runs after fix-aliases, on converted values
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        aliased = copy.deepcopy(components)
+        fix_aliases_recursive(aliased)
+
+    return [
+        Case('convert_flat_to_w3c', len(flat), lambda: convert_flat_to_w3c(flat)),
+        Case('extract_component', len(flat), lambda: extract_component(flat, prefix)),
+        Case('fix_aliases_recursive', component_tokens, fix_aliases_recursive,
+             lambda: (copy.deepcopy(components),)),
+        Case('fix_types_by_alias', component_tokens, fix_types_by_alias,
+             lambda: (copy.deepcopy(aliased),)),
+        Case('resolve_brands', count_tokens(token_set) - component_tokens,
+             lambda: BrandTable.from_trees({'global': token_set['global'], 'semantic': token_set['semantic']}).resolve()),
+    ]
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    """Best-of-`repeat` wall time and tracemalloc peak of one case."""
+    timings = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            args = case.setup()
+            start = time.perf_counter()
+            case.run(*args)
+            timings.append(time.perf_counter() - start)
+
+        args = case.setup()
+        tracemalloc.start()
+        try:
+            case.run(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = min(timings)
+    tokens = max(case.tokens, 1)
+    return {
+        'case': case.name,
+        'tokens': case.tokens,
+        'ms': round(best * 1000, 3),
+        'us_per_token': round(best * 1e6 / tokens, 4),
+        'peak_kib': round(peak / 1024, 1),
+        'bytes_per_token': round(peak / tokens, 1),
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = 3, alias_depth: int = 3, brands=BRANDS,
+              seed: int = 0, cases: Optional[List[str]] = None, log=None) -> List[Dict[str, Any]]:
+    """Measure every case at every size; return one result row per (size, case)."""
+    rows = []
+    for size in sizes:
+        for case in build_cases(size, alias_depth, brands, seed):
+            if cases and case.name not in cases:
+                continue
+            row = dict(measure(case, repeat), size=size)
+            rows.append(row)
+            if log:
+                log(row)
+    return rows
+
+
+def check_thresholds(rows: List[Dict], thresholds: Dict[str, Dict[str, float]]) -> List[str]:
+    """Failures of the per-token limits, as readable messages."""
+    failures = []
+    for row in rows:
+        for metric, limit in thresholds.get(row['case'], {}).items():
+            if row[metric] > limit:
+                failures.append(f"{row['case']} @ {row['size']}: {metric} {row[metric]} > {limit}")
+    return failures
+
+
+def check_baseline(rows: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Failures where a case got slower than `tolerance` (0.25 = +25%) relative to a previous run."""
+    previous = {(row['case'], row['size']): row for row in baseline}
+    failures = []
+    for row in rows:
+        before = previous.get((row['case'], row['size']))
+        if before is None:
+            continue
+        for metric in ('us_per_token', 'bytes_per_token'):
+            if before[metric] and row[metric] > before[metric] * (1 + tolerance):
+                failures.append(
+                    f"{row['case']} @ {row['size']}: {metric} {before[metric]} → {row[metric]} "
+                    f"(+{(row[metric] / before[metric] - 1) * 100:.0f}%)"
+                )
+    return failures
+
+
+def print_row(row: Dict) -> None:
+    print(f"  {row['size']:>9,}  {row['case']:22} {row['ms']:11.2f} ms  {row['us_per_token']:8.3f} µs/token  "
+          f"peak {row['peak_kib']:10.1f} KiB  {row['bytes_per_token']:8.1f} B/token")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the staging-tokens scripts on synthetic token sets.")
+    parser.add_argument("--sizes", default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated token counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, best is kept")
+    parser.add_argument("--alias-depth", type=int, default=3, help="levels of semantic aliases")
+    parser.add_argument("--brands", default=','.join(BRANDS), help="comma-separated brand names")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--case", action="append", dest="cases", help="only run this case (repeatable)")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    parser.add_argument("--thresholds", help="JSON file of per-token limits (default: built-in table)")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown relative to --baseline (default: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    brands = args.brands.split(',')
+    thresholds = DEFAULT_THRESHOLDS
+    if args.thresholds:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            thresholds = json.load(f)
+
+    print(f"Benchmarking {len(sizes)} sizes, alias depth {args.alias_depth}, {len(brands)} brands...")
+    rows = run_suite(sizes, args.repeat, args.alias_depth, brands, args.seed, args.cases, log=print_row)
+
+    failures = check_thresholds(rows, thresholds)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures += check_baseline(rows, json.load(f)['results'], args.tolerance)
+
+    if args.output:
+        write_json_atomic(args.output, {
+            'version': RESULTS_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {'sizes': sizes, 'repeat': args.repeat, 'alias_depth': args.alias_depth,
+                       'brands': brands, 'seed': args.seed},
+            'thresholds': thresholds,
+            'results': rows,
+            'failures': failures,
+        }, indent=2, ensure_ascii=False)
+        print(f"✓ Results saved to {args.output}")
+
+    if failures:
+        print(f"⚠️  {len(failures)} regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("✅ All cases within thresholds")
+
+
+if __name__ == "__main__":
+    main()
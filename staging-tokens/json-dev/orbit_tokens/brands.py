@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Brand-columnar representation of multi-brand token trees.
+
+In the orbit-audit files a semantic token's $value is a map keyed by brand
+({"orbit": ..., "mooney": ..., ...}). Instead of walking the whole tree once
+per brand, token paths are interned once and every brand is stored as one
+dense column: a list of literal values plus an array of reference ids (the
+interned id of the token a cell aliases, or -1 for a literal). Resolving all
+brands is then a single pass over the tokens in dependency order, updating
+every column at once. Adding a brand only appends a column.
+"""
+
+import json
+import os
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+
+from .files import write_json_if_changed
+from .resolve import ALIAS_PATTERN, TokenGraph, substitute_references
+
+LITERAL = -1
+
+# $type values whose $value is a composite object rather than a brand map
+COMPOSITE_TYPES = ('shadow', 'typography', 'border', 'transition', 'gradient', 'strokeStyle', 'cubicBezier')
+
+
+def is_brand_map(token: Dict) -> bool:
+    """True when the token's $value is a per-brand map."""
+    return isinstance(token['$value'], dict) and token.get('$type') not in COMPOSITE_TYPES
+
+
+def detect_brands(tokens: Dict[str, Dict]) -> List[str]:
+    """Collect brand names, in first-seen order, from the per-brand $value maps."""
+    brands: Dict[str, None] = {}
+    for token in tokens.values():
+        if is_brand_map(token):
+            brands.update(dict.fromkeys(token['$value']))
+    return list(brands)
+
+
+class BrandTable:
+    """Interned token paths with one dense value/reference column per brand."""
+
+    def __init__(self, graph: TokenGraph, brands: Optional[List[str]] = None):
+        self.graph = graph
+        self.paths: List[str] = list(graph.tokens)
+        self.ids: Dict[str, int] = {path: i for i, path in enumerate(self.paths)}
+        self.types: List[Optional[str]] = [graph.tokens[path].get('$type') for path in self.paths]
+        self.brands: List[str] = []
+        self.values: Dict[str, List[Any]] = {}
+        self.refs: Dict[str, array] = {}
+
+        order, self.cycles = graph.topological_order()
+        self._order = [self.ids[path] for path in order]
+        self._ordered = set(self._order)
+        self._unordered = [i for i in range(len(self.paths)) if i not in self._ordered]
+
+        for brand in brands if brands is not None else detect_brands(graph.tokens):
+            self.add_brand(brand)
+
+    @classmethod
+    def from_trees(cls, *trees: Dict, brands: Optional[List[str]] = None) -> 'BrandTable':
+        return cls(TokenGraph.from_trees(*trees), brands)
+
+    def _cell(self, value: Any):
+        """Split a raw cell into (literal, reference id)."""
+        if isinstance(value, str) and '{' in value:
+            match = ALIAS_PATTERN.fullmatch(value)
+            if match:
+                target = self.graph.lookup.get(match.group(1))
+                if target is not None:
+                    return None, self.ids[target]
+        return value, LITERAL
+
+    def add_brand(self, brand: str, fallback: Optional[str] = None) -> None:
+        """
+        Append a column for `brand`. Tokens without a value for it take the
+        value of the `fallback` brand's cell, or None.
+        """
+        if brand in self.values:
+            return
+        values: List[Any] = []
+        refs = array('l')
+
+        for i, path in enumerate(self.paths):
+            token = self.graph.tokens[path]
+            raw = token['$value']
+            if is_brand_map(token):
+                if brand in raw:
+                    raw = raw[brand]
+                elif fallback is not None:
+                    values.append(self.values[fallback][i])
+                    refs.append(self.refs[fallback][i])
+                    continue
+                else:
+                    raw = None
+            literal, ref = self._cell(raw)
+            values.append(literal)
+            refs.append(ref)
+
+        self.brands.append(brand)
+        self.values[brand] = values
+        self.refs[brand] = refs
+
+    def resolve(self) -> Dict[str, List[Any]]:
+        """Resolve every brand column in one pass over the dependency order."""
+        columns = [(self.values[b], self.refs[b], [None] * len(self.paths), {}) for b in self.brands]
+        lookup = self.graph.lookup
+        ids = self.ids
+        ordered = self._ordered
+
+        for i in self._order:
+            for column in columns:
+                values, refs, resolved, _ = column
+                ref = refs[i]
+                if ref != LITERAL:
+                    resolved[i] = resolved[ref] if ref in ordered else self._chase(ref, column)
+                    continue
+                value = values[i]
+                if isinstance(value, (str, dict, list)) and self.paths[i] in self.graph.edges:
+                    value = substitute_references(
+                        value, lambda r: self._chase(ids[lookup[r]], column) if r in lookup else None
+                    )
+                resolved[i] = value
+
+        for column in columns:
+            for i in self._unordered:
+                column[2][i] = self._chase(i, column)
+
+        return {brand: column[2] for brand, column in zip(self.brands, columns)}
+
+    def _chase(self, i: int, column) -> Any:
+        """
+        Resolved value of cell `i` of one brand column. Tokens caught in a
+        reference cycle of the union graph may still be acyclic for a given
+        brand: they are left out of the dependency order and resolved here on
+        demand (memoized), so the ordered tokens referencing them see their
+        value. A cycle within the brand resolves to None.
+        """
+        values, refs, resolved, memo = column
+        if i in self._ordered:
+            return resolved[i]
+        if i in memo:
+            return memo[i]
+        memo[i] = None
+        ref = refs[i]
+        if ref != LITERAL:
+            value = self._chase(ref, column)
+        else:
+            value = values[i]
+            if isinstance(value, (str, dict, list)) and self.paths[i] in self.graph.edges:
+                lookup = self.graph.lookup
+                value = substitute_references(
+                    value, lambda r: self._chase(self.ids[lookup[r]], column) if r in lookup else None
+                )
+        memo[i] = value
+        return value
+
+    def brand_tokens(self, brand: str, resolved: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Any]:
+        """Flat {path: resolved value} view of one brand."""
+        column = (resolved or self.resolve())[brand]
+        return dict(zip(self.paths, column))
+
+    def emit(self, resolved: Optional[Dict[str, List[Any]]] = None) -> Dict[str, Dict]:
+        """Build one nested W3C tree per brand with fully resolved values."""
+        resolved = resolved or self.resolve()
+        trees: Dict[str, Dict] = {brand: {} for brand in self.brands}
+
+        for i, path in enumerate(self.paths):
+            parts = path.split('.')
+            token_type = self.types[i]
+            for brand in self.brands:
+                current = trees[brand]
+                for part in parts[:-1]:
+                    current = current.setdefault(part, {})
+                token = {'$value': resolved[brand][i]}
+                if token_type is not None:
+                    token['$type'] = token_type
+                current[parts[-1]] = token
+
+        return trees
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m orbit_tokens.brands <tokens.json> [more.json ...] [--out-dir DIR]")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    out_dir = None
+    if '--out-dir' in args:
+        position = args.index('--out-dir')
+        out_dir = args[position + 1]
+        del args[position:position + 2]
+
+    trees = []
+    for input_file in args:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            trees.append(json.load(f))
+
+    table = BrandTable.from_trees(*trees)
+    print(f"{len(table.paths)} tokens × {len(table.brands)} brands ({', '.join(table.brands)})")
+    for path, owners in table.graph.collisions.items():
+        print(f"⚠️  {path}: defined in {', '.join(args[index] for index in owners)} (the last one wins)")
+
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(args[0]))[0]
+        for brand, tree in table.emit().items():
+            output_file = os.path.join(out_dir, f"{stem}.{brand}.json")
+            if write_json_if_changed(output_file, tree):
+                print(f"✓ {output_file}")
+            else:
+                print(f"✓ {output_file} is unchanged, not rewritten")
+
+
+if __name__ == "__main__":
+    main()
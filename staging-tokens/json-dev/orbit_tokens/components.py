@@ -0,0 +1,172 @@
+"""
+Component token extraction from flat theme files (e.g. theme-mooneygo.json).
+
+The flat theme is indexed once by key prefix, so extracting many components
+costs one sort plus a range lookup per component instead of a full scan of
+the theme for every entry in the components map.
+
+Hardcoded values are turned into aliases by value with a ValueIndex of the
+sets of clara-tokens.json (see values.py); convert_alias() only handles the
+values the index cannot match.
+"""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional
+
+from .inference import studio_types
+from .passes import count_tokens
+from .values import ValueIndex, alias_index
+
+# Componenti da estrarre da theme-mooneygo.json (nome in clara-tokens.json: prefisso)
+COMPONENTS_MAP = {
+    'accordion': 'UIAccordion.',
+    'tab': 'UITabBar.',
+    'modal': 'mixins.modals.',
+    'bottomSheet': 'mixins.bottomSheet.',
+    'dropdown': 'UILinkedCardCart.dropdown',
+    'textInput': 'UITextInput.',
+    'button': 'UIButton.',
+    'checkbox': 'UICheckbox.',
+    'radioToggle': 'UIRadioToggle.',
+    'banner': 'UIBanner.',
+}
+
+
+def convert_alias(value):
+    """Converte un valore in alias se è un riferimento a token esistente"""
+    if isinstance(value, str) and value.isupper() and not value.startswith('#') and not value.startswith('rgba'):
+        # Mapping specifici per colori comuni
+        if value == 'WHITE':
+            return '{global.colors.neutral.white}'
+        elif value == 'BLACK':
+            return '{global.colors.neutral.black}'
+        elif value == 'TRANSPARENT':
+            return '{global.colors.neutral.transparent}'
+        elif value.startswith('GREYSCALE_'):
+            num = value.replace('GREYSCALE_', '')
+            return f'{{global.colors.greyscale.{num}}}'
+        elif value.startswith('FEEDBACK_'):
+            parts = value.replace('FEEDBACK_', '').lower().split('_')
+            if len(parts) == 2:
+                return f'{{global.colors.feedback.{parts[0]}.{parts[1]}}}'
+    return value
+
+
+def get_type(key, value):
+    """Deduce il $type basandosi sul nome della chiave o valore"""
+    return studio_types.infer(key, value)
+
+
+class PrefixIndex:
+    """Sorted view of the keys of a flat dict, answering prefix queries by bisection."""
+
+    def __init__(self, flat_dict: Dict[str, Any]):
+        self.flat_dict = flat_dict
+        self._order = {key: position for position, key in enumerate(flat_dict)}
+        self._keys = sorted(flat_dict)
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """Return the keys starting with `prefix`, in the original insertion order."""
+        keys = self._keys
+        start = bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        matches = keys[start:end]
+        matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def build_nested(
+    flat_dict: Dict[str, Any],
+    keys: List[str],
+    prefix: str,
+    convert_value: Callable[[Any], Any] = convert_alias,
+    infer_type: Callable[[str, Any], str] = get_type,
+    value_index: Optional[ValueIndex] = None,
+) -> Dict:
+    """
+    Nest `keys` (all starting with `prefix`) into $value/$type token groups.
+    String values are aliased by `value_index` when given, and passed to
+    `convert_value` when it has no match.
+    """
+    nested = {}
+    prefix_len = len(prefix)
+
+    for key in keys:
+        value = flat_dict[key]
+        parts = key[prefix_len:].split('.')
+
+        current = nested
+        for part in parts[:-1]:
+            if part not in current:
+                current[part] = {}
+            current = current[part]
+
+        last_key = parts[-1]
+        token_type = infer_type(last_key, value)
+        alias = None
+        if value_index is not None and isinstance(value, str):
+            alias = value_index.alias(value, token_type, last_key)
+        current[last_key] = {
+            '$value': convert_value(value) if alias is None else alias,
+            '$type': token_type
+        }
+
+    return nested
+
+
+def extract_components(
+    flat_dict: Dict[str, Any],
+    components_map: Dict[str, str],
+    convert_value: Callable[[Any], Any] = convert_alias,
+    infer_type: Callable[[str, Any], str] = get_type,
+    value_index: Optional[ValueIndex] = None,
+) -> Dict[str, Dict]:
+    """
+    Extract every component of `components_map` ({name: key prefix}) from a flat theme.
+
+    The theme keys are indexed once; each component is then a range lookup on
+    the index. Components with no matching keys map to an empty dict.
+    """
+    index = flat_dict if isinstance(flat_dict, PrefixIndex) else PrefixIndex(flat_dict)
+
+    return {
+        comp_name: build_nested(
+            index.flat_dict, index.keys_with_prefix(prefix), prefix, convert_value, infer_type, value_index
+        )
+        for comp_name, prefix in components_map.items()
+    }
+
+
+def import_components(
+    clara: Dict,
+    flat_dict: Dict[str, Any],
+    components_map: Dict[str, str] = COMPONENTS_MAP,
+    value_index: Optional[ValueIndex] = None,
+) -> Dict[str, int]:
+    """
+    Extract the components of `components_map` into clara['components'].
+    Values are aliased by `value_index`, by default built from the sets of
+    `clara` and the names of `flat_dict`. Return {component: number of
+    tokens}; components with no matching keys count 0 and are left untouched.
+    """
+    if value_index is None:
+        value_index = alias_index(clara, flat_dict)
+    collection = clara.setdefault('components', {})
+    extracted = extract_components(flat_dict, components_map, value_index=value_index)
+    counts = {}
+    for comp_name, nested in extracted.items():
+        counts[comp_name] = count_tokens(nested)
+        if nested:
+            collection[comp_name] = nested
+    return counts
+
+
+def extract_component(flat_dict, component_prefix):
+    """Estrae tutte le chiavi di un componente e le converte in struttura nested"""
+    keys = [key for key in flat_dict if key.startswith(component_prefix)]
+    return build_nested(flat_dict, keys, component_prefix)
@@ -0,0 +1,116 @@
+"""
+File helpers shared by the token scripts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import IO, Any, Optional
+
+
+class atomic_output:
+    """
+    Open a temporary file next to `path` for writing (text, or bytes when
+    `binary`) and rename it into place on success, so readers never see a
+    half-written file. With `if_changed`, a result identical to the current
+    content of `path` is discarded instead; `written` tells which happened.
+
+        output = atomic_output(path, if_changed=True)
+        with output as f:
+            f.write(text)
+        output.written
+    """
+
+    def __init__(self, path: str, binary: bool = False, if_changed: bool = False):
+        self.path = path
+        self.binary = binary
+        self.if_changed = if_changed
+        self.written = False
+
+    def __enter__(self) -> IO:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(self.path), suffix='.tmp')
+        try:
+            self._file = os.fdopen(fd, 'wb') if self.binary else os.fdopen(fd, 'w', encoding='utf-8')
+        except BaseException:
+            os.close(fd)
+            os.unlink(self._tmp_path)
+            raise
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        tmp_path = self._tmp_path
+        try:
+            self._file.close()
+            if exc_type is None and not (self.if_changed and _same_file(tmp_path, self.path)):
+                # mkstemp creates the file as 0600; give it the usual umask-based mode
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+                os.replace(tmp_path, self.path)
+                self.written = True
+        finally:
+            # Left over on errors, or when the content was unchanged
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def write_json_atomic(path: str, data: Any, **dump_kwargs) -> int:
+    """Serialize `data` to `path` atomically; return the number of bytes written."""
+    dump_kwargs.setdefault('indent', 2)
+    dump_kwargs.setdefault('ensure_ascii', False)
+    text = json.dumps(data, **dump_kwargs)
+    with atomic_output(path) as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(path: str) -> Optional[str]:
+    """content_hash() of a file, or None when it cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+
+def _same_file(a: str, b: str) -> bool:
+    """True when both files exist with the same content (same size, then same hash)."""
+    try:
+        if os.path.getsize(a) != os.path.getsize(b):
+            return False
+    except OSError:
+        return False
+    return file_hash(a) == file_hash(b)
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """
+    Atomically write `data` to `path` unless the file already holds the
+    same content (same size, then same hash). Return True if written.
+    """
+    try:
+        same_size = os.path.getsize(path) == len(data)
+    except OSError:
+        same_size = False
+    if same_size and file_hash(path) == content_hash(data):
+        return False
+    with atomic_output(path, binary=True) as f:
+        f.write(data)
+    return True
+
+
+def write_json_if_changed(path: str, data: Any, **dump_kwargs) -> int:
+    """
+    Serialize `data` like write_json_atomic() and write it only if the
+    content changed. Return the number of bytes written, 0 when skipped.
+    """
+    dump_kwargs.setdefault('indent', 2)
+    dump_kwargs.setdefault('ensure_ascii', False)
+    encoded = json.dumps(data, **dump_kwargs).encode('utf-8')
+    return len(encoded) if write_if_changed(path, encoded) else 0
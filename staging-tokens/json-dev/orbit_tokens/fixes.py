@@ -0,0 +1,183 @@
+"""
+Fixes applied to the component tokens of clara-tokens.json: hardcoded values
+to aliases (fix-aliases.py; by value with AutoAliasPass, or from ALIAS_MAP
+alone with AliasFixPass) and $type from the alias (fix-types-by-alias.py).
+"""
+
+from typing import Dict, List
+
+from .inference import studio_types
+from .passes import TokenPass, walk
+
+# Mapping completo alias
+ALIAS_MAP = {
+    # Neutral colors
+    'WHITE': '{global.colors.neutral.white}',
+    'BLACK': '{global.colors.neutral.black}',
+    'TRANSPARENT': '{global.colors.neutral.transparent}',
+
+    # Spacing/Radius (NONE, XS, S, M, L, XL → none, xs, sm, md, lg, xl, 2xl)
+    'NONE': '0',
+    'XS': '{global.radius.xs}',     # 4px radius
+    'S': '{global.radius.sm}',      # 8px radius
+    'M': '{global.radius.md}',      # 10px radius (o spacing md=20px per padding)
+    'L': '{global.radius.lg}',      # 12px radius
+    'XL': '{global.radius.xl}',     # 16px radius
+    'XXL': '{global.radius.2xl}',   # 18px radius
+
+    # Greyscale
+    'GREYSCALE_1': '{global.colors.greyscale.1}',
+    'GREYSCALE_2': '{global.colors.greyscale.2}',
+    'GREYSCALE_3': '{global.colors.greyscale.3}',
+    'GREYSCALE_4': '{global.colors.greyscale.4}',
+    'GREYSCALE_5': '{global.colors.greyscale.5}',
+
+    # Feedback colors
+    'FEEDBACK_ERROR_DARK': '{global.colors.feedback.error.dark}',
+    'FEEDBACK_ERROR_LIGHT': '{global.colors.feedback.error.light}',
+    'FEEDBACK_WARNING_DARK': '{global.colors.feedback.warning.dark}',
+    'FEEDBACK_WARNING_LIGHT': '{global.colors.feedback.warning.light}',
+    'FEEDBACK_SUCCESS_DARK': '{global.colors.feedback.success.dark}',
+    'FEEDBACK_SUCCESS_LIGHT': '{global.colors.feedback.success.light}',
+    'FEEDBACK_INFO_DARK': '{global.colors.feedback.info.dark}',
+    'FEEDBACK_INFO_LIGHT': '{global.colors.feedback.info.light}',
+
+    # MooneyGo specific colors - mappati a semantic (assumendo che esistano)
+    'MOONEYGO_PRIMARY_3': '{semantic.brand.core.main}',
+    'MOONEYGO_SECONDARY_1': '{semantic.brand.alt.light}',
+    'MOONEYGO_SECONDARY_3': '{semantic.brand.core.secondary}',
+    'MOONEYGO_BLUE': '{semantic.brand.core.accent}',
+    'MOONEYGO_GREY1': '{semantic.colors.background.subtle}',
+    'MOONEYGO_GREY2': '{semantic.colors.border.default}',
+    'MOONEYGO_GREY10': '{semantic.colors.text.primary}',
+    'MOONEYGO_EXTRA_COLOR_1_BLUE': '{semantic.colors.background.info}',
+
+    # Backdrop
+    'BACKDROP_COLOR': '{semantic.colors.overlay.backdrop}',
+
+    # Tag status colors
+    'TAG_STATUS_WARNING_DARK': '{global.colors.feedback.warning.dark}',
+    'TAG_STATUS_INFO_DARK': '{global.colors.feedback.info.dark}',
+    'TAG_STATUS_ERROR_DARK': '{global.colors.feedback.error.dark}',
+    'TAG_STATUS_SUCCESS_DARK': '{global.colors.feedback.success.dark}',
+}
+
+
+def convert_value(value):
+    """Converte un valore usando la mappa alias"""
+    if isinstance(value, str) and value in ALIAS_MAP:
+        return ALIAS_MAP[value]
+    return value
+
+
+def get_type_from_alias(value):
+    """Determina il $type corretto basandosi sull'alias"""
+    return studio_types.alias_type(value)
+
+
+def is_unconverted(value) -> bool:
+    """True for values that still look like a hardcoded theme name (e.g. GREYSCALE_1)"""
+    return (
+        isinstance(value, str) and value.isupper()
+        and not value.startswith('#') and not value.startswith('rgba') and not value.startswith('{')
+    )
+
+
+class AliasFixPass(TokenPass):
+    """Converte i nomi hardcoded in alias usando ALIAS_MAP"""
+
+    name = 'aliases'
+
+    def visit(self, token, path):
+        old_value = token['$value']
+        new_value = convert_value(old_value)
+
+        if new_value != old_value:
+            token['$value'] = new_value
+            self.fixes += 1
+            if self.log:
+                self.log(f"  🔧 {path}: {old_value} → {new_value}")
+
+
+class AutoAliasPass(TokenPass):
+    """
+    Converte valori hardcoded (nomi del tema e colori/dimensioni letterali) in
+    alias trovati per valore canonico in un ValueIndex; ALIAS_MAP resta come
+    fallback per i nomi senza corrispondenza.
+    """
+
+    name = 'aliases'
+
+    def __init__(self, index, log=None, fallback=True):
+        super().__init__(log)
+        self.index = index
+        self.fallback = fallback
+
+    def visit(self, token, path):
+        old_value = token['$value']
+        if not isinstance(old_value, str) or '{' in old_value:
+            return
+        new_value = self.index.alias(old_value, token.get('$type'), path.rsplit('.', 1)[-1])
+        if new_value is None and self.fallback:
+            new_value = convert_value(old_value)
+
+        if new_value is not None and new_value != old_value:
+            token['$value'] = new_value
+            self.fixes += 1
+            if self.log:
+                self.log(f"  🔧 {path}: {old_value} → {new_value}")
+
+
+class TypeFixPass(TokenPass):
+    """Corregge $type basandosi sull'alias"""
+
+    name = 'types'
+
+    def visit(self, token, path):
+        if '$type' not in token:
+            return
+        value = token['$value']
+        current_type = token['$type']
+        correct_type = get_type_from_alias(value)
+
+        if correct_type and correct_type != current_type:
+            token['$type'] = correct_type
+            self.fixes += 1
+            if self.log:
+                self.log(f"  🔧 {path}: $type {current_type} → {correct_type} (alias: {value[:40]}...)")
+
+
+class UnconvertedCheck(TokenPass):
+    """Raccoglie gli alias ancora da convertire (verifica, nessuna modifica)"""
+
+    name = 'unconverted'
+
+    def __init__(self, log=None):
+        super().__init__(log)
+        self.unconverted: List[str] = []
+
+    def visit(self, token, path):
+        val = token['$value']
+        if is_unconverted(val):
+            self.unconverted.append(f'{path}: {val}')
+
+
+def fix_aliases_recursive(obj, path='', log=None):
+    """Converte ricorsivamente tutti gli alias in un oggetto"""
+    alias_pass = AliasFixPass(log)
+    walk(obj, [alias_pass], path)
+    return alias_pass.fixes
+
+
+def fix_types_by_alias(obj, path='', log=None):
+    """Corregge $type basandosi sull'alias"""
+    type_pass = TypeFixPass(log)
+    walk(obj, [type_pass], path)
+    return type_pass.fixes
+
+
+def find_unconverted(obj: Dict, path='') -> List[str]:
+    """Elenca i token con alias ancora da convertire"""
+    check = UnconvertedCheck()
+    walk(obj, [check], path)
+    return check.unconverted
@@ -0,0 +1,117 @@
+"""
+Incremental flat → W3C conversion.
+
+A manifest with the flat values and the inferred $type of every key is
+stored next to the W3C output. On the next run the values are compared with
+the snapshot (plain equality, no hashing) and only added or changed keys are
+inferred again; the tree is rebuilt from the stored types, in input order,
+so the output is the same as a full conversion. The previous output is not
+read back.
+
+The saving is the type inference. On theme-mooneygo.json, in a fresh
+process, a one-key edit spends about 8 ms in the convert stage against
+12.5 ms for a full conversion, but saving the manifest adds about 3.5 ms:
+end to end the two are on par, both dominated by writing the indented
+output. A run with no change stops right after the comparison.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from .files import write_json_if_changed
+from .inference import w3c_types
+from .w3c import set_nested_value
+
+# Bump when the conversion or the manifest layout changes so that old
+# manifests are discarded; the $type rules are covered by the fingerprint of
+# the inference engine
+MANIFEST_VERSION = 3
+
+# {'values': {flat key: value}, 'types': {flat key: $type}}
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+def _same(old: Any, new: Any) -> bool:
+    # 1 == True == 1.0, but they are different tokens
+    return type(old) is type(new) and old == new
+
+
+def diff_values(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+    """Return (added, changed, removed) keys between two flat snapshots."""
+    added = []
+    changed = []
+    for key, value in new.items():
+        if key not in old:
+            added.append(key)
+        elif not _same(old[key], value):
+            changed.append(key)
+    removed = [key for key in old if key not in new] if len(old) + len(added) != len(new) else []
+    return added, changed, removed
+
+
+def default_manifest_path(output_file: str) -> str:
+    return f"{output_file}.manifest.json"
+
+
+def load_manifest(manifest_file: str) -> Optional[Snapshot]:
+    """Return the snapshot of a manifest, or None if it is missing or stale."""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('rules') != w3c_types.fingerprint:
+        return None
+    values = manifest['values']
+    if len(manifest['types']) != len(values):
+        return None
+    return {'values': values, 'types': dict(zip(values, manifest['types']))}
+
+
+def save_manifest(manifest_file: str, snapshot: Snapshot) -> int:
+    """Write the manifest atomically, only if it changed; return the bytes written (0 when skipped)."""
+    # Types as a list in key order: the keys are not written twice
+    manifest = {'version': MANIFEST_VERSION, 'rules': w3c_types.fingerprint,
+                'values': snapshot['values'], 'types': [snapshot['types'][key] for key in snapshot['values']]}
+    return write_json_if_changed(manifest_file, manifest, indent=None)
+
+
+def convert_with_types(flat_tokens: Dict, types: Dict[str, str]) -> Dict:
+    """convert_flat_to_w3c() taking the $type from `types`; missing types are inferred and added to it."""
+    w3c_tokens: Dict = {}
+    for flat_key, value in flat_tokens.items():
+        token_type = types.get(flat_key)
+        if token_type is None:
+            token_type = types[flat_key] = w3c_types.infer(flat_key, value)
+        set_nested_value(w3c_tokens, flat_key.split('.'), value, flat_key, token_type=token_type)
+    return w3c_tokens
+
+
+def convert_incremental(flat_tokens: Dict, output_file: str, manifest_file: Optional[str] = None) -> Tuple[Dict, Snapshot, Dict[str, int]]:
+    """
+    Convert `flat_tokens`, reusing the types of the keys unchanged since the
+    manifest was saved (when it matches and `output_file` still exists).
+
+    Return (w3c_tokens, snapshot, stats): snapshot is the manifest to save
+    once the output has been written, stats counts added, changed and removed
+    keys ('full' is 1 when every type had to be inferred). w3c_tokens is None
+    when nothing changed: the output is up to date.
+    """
+    manifest_file = manifest_file or default_manifest_path(output_file)
+    previous = load_manifest(manifest_file) if os.path.exists(output_file) else None
+
+    if previous is None:
+        types: Dict[str, str] = {}
+        stats = {'added': len(flat_tokens), 'changed': 0, 'removed': 0, 'full': 1}
+    else:
+        added, changed, removed = diff_values(previous['values'], flat_tokens)
+        stats = {'added': len(added), 'changed': len(changed), 'removed': len(removed), 'full': 0}
+        if not (added or changed or removed):
+            return None, previous, stats
+        types = previous['types']
+        for flat_key in changed + removed:
+            del types[flat_key]
+
+    w3c_tokens = convert_with_types(flat_tokens, types)
+    return w3c_tokens, {'values': flat_tokens, 'types': types}, stats
@@ -0,0 +1,116 @@
+"""
+Structured instrumentation for the token scripts.
+
+A Metrics object collects per-stage wall-clock timers, counters (tokens
+visited, fixes, bytes and files read and written) and a sample of the fix
+log lines, and dumps them as a JSON report:
+
+    {"total_ms": ..., "stages_ms": {"read": ..., "fix": ...},
+     "counters": {"tokens_visited": ..., "fixes": ..., "bytes_read": ...},
+     "files": {"clara-tokens.json": "unchanged"}, "fix_samples": [...]}
+
+Printing one line per fix dominates the runtime on large trees, so fix
+lines are only formatted when sampling is on (--log-sample N keeps one line
+out of N, 0 none). Files are read and written through the Metrics object:
+writes are atomic and skipped when the serialized content is unchanged.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .files import write_if_changed, write_json_atomic
+
+# Fix lines kept in the report, whatever the sampling rate
+MAX_SAMPLES = 100
+
+
+class Metrics:
+    """Timers, counters and sampled fix logs of one run."""
+
+    def __init__(self, log: Optional[Callable[[str], Any]] = print, log_sample: int = 1):
+        self.log = log
+        self.log_sample = log_sample
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.files: Dict[str, str] = {}
+        self.samples: List[str] = []
+        self._start = time.perf_counter()
+
+    @classmethod
+    def from_args(cls, args, log: Optional[Callable[[str], Any]] = print) -> 'Metrics':
+        return cls(log, args.log_sample)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def fix_log(self) -> Optional[Callable[[str], None]]:
+        """
+        Log callable for the passes, or None when sampling is off (the
+        passes then skip formatting the lines altogether).
+        """
+        if not self.log_sample:
+            return None
+
+        def log(message: str) -> None:
+            self.count('fix_lines')
+            if (self.counters['fix_lines'] - 1) % self.log_sample:
+                return
+            if len(self.samples) < MAX_SAMPLES:
+                self.samples.append(message.strip())
+            if self.log:
+                self.log(message)
+
+        return log
+
+    def read_json(self, path: str) -> Any:
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.count('files_read')
+        self.count('bytes_read', len(data))
+        return json.loads(data)
+
+    def write_json(self, path: str, data: Any, **dump_kwargs) -> bool:
+        """Write `data` atomically unless `path` already holds it. Return True if written."""
+        dump_kwargs.setdefault('indent', 2)
+        dump_kwargs.setdefault('ensure_ascii', False)
+        encoded = json.dumps(data, **dump_kwargs).encode('utf-8')
+        written = write_if_changed(path, encoded)
+        if written:
+            self.count('files_written')
+            self.count('bytes_written', len(encoded))
+        else:
+            self.count('files_unchanged')
+        self.files[path] = 'written' if written else 'unchanged'
+        return written
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'total_ms': round((time.perf_counter() - self._start) * 1000, 3),
+            'stages_ms': {name: round(ms, 3) for name, ms in self.stages.items()},
+            'counters': dict(self.counters),
+            'files': dict(self.files),
+            'fix_samples': list(self.samples),
+        }
+
+    def save(self, path: Optional[str]) -> None:
+        """Write the JSON report to `path` (nothing when None)."""
+        if path:
+            write_json_atomic(path, self.report())
+
+
+def add_arguments(parser) -> None:
+    """The --metrics and --log-sample options shared by the scripts."""
+    parser.add_argument("--metrics", metavar="FILE", help="write a JSON report of timings and counters")
+    parser.add_argument("--log-sample", type=int, default=1, metavar="N",
+                        help="print one fix line out of N (0: none; default: %(default)s)")
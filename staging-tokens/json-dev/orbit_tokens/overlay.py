@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Brand themes stored as overlays on top of a base theme.
+
+Most keys of a brand theme (theme-mooneygo.json) have the same value as in
+theme-base.json. An overlay file keeps only the difference:
+
+    {
+      "$base": "theme-base.json",
+      "$set": {"colors.GREYSCALE_1": "#f6f6f6", ...},
+      "$unset": ["colors.SOME_REMOVED_KEY", ...]
+    }
+
+"$base" is relative to the overlay file and may itself be an overlay. At
+runtime an OverlayTheme is a copy-on-write chained mapping: reads fall
+through to the shared base, writes and deletions only touch the overlay.
+"""
+
+import argparse
+import json
+import os
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .files import write_json_atomic
+from .w3c import convert_flat_to_w3c
+
+OVERLAY_EXTENSION = 'com.orbit.overlay'
+
+
+def diff_theme(base: Mapping[str, Any], theme: Mapping[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Return (overrides, removed): what `theme` changes or adds, and which base keys it drops."""
+    overrides = {key: value for key, value in theme.items() if key not in base or base[key] != value}
+    removed = [key for key in base if key not in theme]
+    return overrides, removed
+
+
+def is_overlay(data: Mapping) -> bool:
+    return '$base' in data
+
+
+class OverlayTheme(MutableMapping):
+    """Flat theme = base theme + overrides - removed keys, without copying the base."""
+
+    def __init__(self, base: Mapping[str, Any], overrides: Optional[Dict[str, Any]] = None,
+                 removed: Optional[List[str]] = None, base_file: Optional[str] = None):
+        self.base = base
+        self.overrides: Dict[str, Any] = dict(overrides or {})
+        self.removed = set(removed or ())
+        self.base_file = base_file
+
+    @classmethod
+    def from_themes(cls, base: Mapping[str, Any], theme: Mapping[str, Any], base_file: Optional[str] = None) -> 'OverlayTheme':
+        overrides, removed = diff_theme(base, theme)
+        return cls(base, overrides, removed, base_file)
+
+    @classmethod
+    def from_data(cls, data: Mapping[str, Any], path: str) -> 'OverlayTheme':
+        """Build from an overlay document read from `path` ($base is relative to it)."""
+        if not is_overlay(data):
+            raise ValueError(f"{path} is not an overlay theme (no $base)")
+        base_file = data['$base']
+        base = load_theme(os.path.join(os.path.dirname(os.path.abspath(path)), base_file))
+        return cls(base, data.get('$set', {}), data.get('$unset', []), base_file)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'OverlayTheme':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_data(json.load(f), path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable overlay document."""
+        data: Dict[str, Any] = {'$base': self.base_file}
+        data['$set'] = self.overrides
+        if self.removed:
+            data['$unset'] = sorted(self.removed)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.overrides:
+            return self.overrides[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.removed.discard(key)
+        if key in self.base and self.base[key] == value:
+            self.overrides.pop(key, None)
+        else:
+            self.overrides[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.overrides.pop(key, None)
+        if key in self.base:
+            self.removed.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.overrides or (key not in self.removed and key in self.base)
+
+    def __iter__(self) -> Iterator[str]:
+        # Base order first, then keys the overlay adds
+        for key in self.base:
+            if key not in self.removed:
+                yield key
+        for key in self.overrides:
+            if key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        added = sum(1 for key in self.overrides if key not in self.base)
+        return len(self.base) - len(self.removed & self.base.keys()) + added
+
+
+def load_theme(path: str) -> Mapping[str, Any]:
+    """Load a flat theme, resolving overlay chains."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if is_overlay(data):
+        return OverlayTheme.from_data(data, path)
+    return data
+
+
+def convert_overrides(overlay: OverlayTheme) -> Dict:
+    """W3C tree of the overridden tokens only; removed keys are listed in $extensions."""
+    w3c_tokens = convert_flat_to_w3c(overlay.overrides)
+    w3c_tokens['$extensions'] = {
+        OVERLAY_EXTENSION: {'base': overlay.base_file, 'unset': sorted(overlay.removed)}
+    }
+    return w3c_tokens
+
+
+def convert_merged(overlay: OverlayTheme) -> Dict:
+    """W3C tree of the fully merged theme."""
+    return convert_flat_to_w3c(overlay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store a brand theme as an overlay on a base theme.")
+    parser.add_argument("base_file", help="base flat theme, e.g. theme-base.json")
+    parser.add_argument("theme_file", help="full brand theme, e.g. theme-mooneygo.json")
+    parser.add_argument("-o", "--output", help="overlay file (default: <theme>.overlay.json)")
+    args = parser.parse_args()
+
+    output_file = args.output or os.path.splitext(args.theme_file)[0] + '.overlay.json'
+    with open(args.base_file, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.theme_file, 'r', encoding='utf-8') as f:
+        theme = json.load(f)
+
+    base_ref = os.path.relpath(os.path.abspath(args.base_file), os.path.dirname(os.path.abspath(output_file)))
+    overlay = OverlayTheme.from_themes(base, theme, base_ref)
+    size = write_json_atomic(output_file, overlay.to_dict())
+
+    print(f"✓ Overlay saved to {output_file} ({size / 1024:.1f} KB)")
+    print(f"  {len(overlay.overrides)} overridden or added, {len(overlay.removed)} removed, "
+          f"{len(theme) - len(overlay.overrides)} inherited from {args.base_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Single-traversal pass pipeline over component token trees.
+
+Each pass is a visitor called on every token node ({"$value": ...}) in one
+walk of the tree, in the order the passes are given. Chaining the alias fix,
+the $type fix and the verification step therefore costs one parse, one
+traversal and one write of clara-tokens.json instead of one of each per
+script.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# Keys of a token node that are not walked into
+TOKEN_KEYS = ('$value', '$type', '$description')
+
+
+class TokenPass:
+    """
+    Base class for a visitor run on every token node. Passes are silent
+    unless given a `log` callable (e.g. print) for one line per fix.
+    """
+
+    name = 'pass'
+
+    def __init__(self, log: Optional[Callable[[str], Any]] = None):
+        self.fixes = 0
+        self.log = log
+
+    def visit(self, token: Dict, path: str) -> None:
+        raise NotImplementedError
+
+
+class TokenCounter(TokenPass):
+    """Counts the token nodes visited, for instrumentation; never fixes anything."""
+
+    name = 'visited'
+
+    def __init__(self, log=None):
+        super().__init__(log)
+        self.visited = 0
+
+    def visit(self, token: Dict, path: str) -> None:
+        self.visited += 1
+
+
+def walk(obj, passes: List[TokenPass], path: str = '') -> None:
+    """Run every pass on each token node of `obj`, in a single traversal."""
+    if not isinstance(obj, dict):
+        return
+    if '$value' in obj:
+        for token_pass in passes:
+            token_pass.visit(obj, path)
+    for key, value in obj.items():
+        if key not in TOKEN_KEYS:
+            walk(value, passes, f'{path}.{key}' if path else key)
+
+
+def run_passes(components: Dict, passes: List[TokenPass]) -> Dict[str, Dict[str, int]]:
+    """Walk every component once; return {component: {pass name: fixes}}."""
+    report = {}
+    for comp_name, component in components.items():
+        before = [token_pass.fixes for token_pass in passes]
+        walk(component, passes, comp_name)
+        report[comp_name] = {
+            token_pass.name: token_pass.fixes - count for token_pass, count in zip(passes, before)
+        }
+    return report
+
+
+def count_tokens(obj: Any) -> int:
+    """Number of token nodes ({"$value": ...}) in a W3C tree."""
+    if not isinstance(obj, dict):
+        return 0
+    if '$value' in obj:
+        return 1
+    return sum(count_tokens(value) for value in obj.values())
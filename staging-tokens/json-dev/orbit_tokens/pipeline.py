@@ -0,0 +1,228 @@
+"""
+In-process token pipeline: the work of import-components-v2.py,
+fix-aliases.py, fix-types-by-alias.py and convert-to-w3c.py as declared
+steps over one in-memory tree.
+
+    python -m orbit_tokens --steps import,fix-aliases,fix-types,convert \\
+        --theme theme-mooneygo.json --clara clara-tokens.json --output theme-mooneygo-w3c.json
+
+Each input file is parsed at most once, on first use, and each output is
+written once at the end (atomically, and not at all when its content is
+unchanged). Consecutive fix steps are fused into
+a single traversal of the components, in the declared order.
+
+import and fix-aliases alias hardcoded values by value, with a ValueIndex of
+the non-component sets of clara-tokens.json and the names of the theme;
+map-aliases only applies the hand-maintained ALIAS_MAP.
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .components import COMPONENTS_MAP, import_components
+from .fixes import AliasFixPass, AutoAliasPass, TypeFixPass, UnconvertedCheck
+from .metrics import Metrics, add_arguments
+from .passes import TokenCounter, TokenPass, run_passes
+from .values import ValueIndex, alias_index
+from .w3c import convert_flat_to_w3c
+
+# Steps that are a pass over the components of clara-tokens.json
+PASS_STEPS: Dict[str, Callable[..., TokenPass]] = {
+    'fix-aliases': AutoAliasPass,
+    'map-aliases': AliasFixPass,
+    'fix-types': TypeFixPass,
+    'check': UnconvertedCheck,
+}
+STEPS = ('import',) + tuple(PASS_STEPS) + ('convert',)
+DEFAULT_STEPS = ('import', 'fix-aliases', 'fix-types', 'convert')
+
+
+class Pipeline:
+    """Runs steps over lazily loaded inputs and writes the outputs once."""
+
+    def __init__(
+        self,
+        theme_file: str = 'theme-mooneygo.json',
+        clara_file: str = 'clara-tokens.json',
+        output_file: Optional[str] = 'theme-mooneygo-w3c.json',
+        components_map: Dict[str, str] = COMPONENTS_MAP,
+        log: Optional[Callable[[str], Any]] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        self.theme_file = theme_file
+        self.clara_file = clara_file
+        self.output_file = output_file
+        self.components_map = components_map
+        self.log = log
+        # Without a log, fix lines are not even formatted
+        self.metrics = metrics or Metrics(log, log_sample=1 if log else 0)
+        self._theme: Optional[Dict[str, Any]] = None
+        self._clara: Optional[Dict] = None
+        self.clara_dirty = False
+        self.w3c_tokens: Optional[Dict] = None
+        self.value_index: Optional[ValueIndex] = None
+        self.report: Dict[str, Any] = {}
+
+    @property
+    def theme(self) -> Dict[str, Any]:
+        if self._theme is None:
+            self._theme = self.metrics.read_json(self.theme_file)
+        return self._theme
+
+    @property
+    def clara(self) -> Dict:
+        if self._clara is None:
+            self._clara = self.metrics.read_json(self.clara_file)
+        return self._clara
+
+    def alias_index(self) -> ValueIndex:
+        """ValueIndex of the non-component sets of clara-tokens.json, built once."""
+        if self.value_index is None:
+            # The theme only adds its names: a fix-only run does not need it
+            has_theme = self._theme is not None or os.path.exists(self.theme_file)
+            self.value_index = alias_index(self.clara, self.theme if has_theme else None)
+        return self.value_index
+
+    def run_import(self) -> None:
+        self.report['import'] = import_components(self.clara, self.theme, self.components_map, self.alias_index())
+        self.metrics.count('tokens_visited', len(self.theme))
+        self.metrics.count('imported', sum(self.report['import'].values()))
+        self.clara_dirty = True
+
+    def make_pass(self, step: str) -> TokenPass:
+        if step == 'fix-aliases':
+            return AutoAliasPass(self.alias_index(), self.metrics.fix_log())
+        return PASS_STEPS[step](self.metrics.fix_log())
+
+    def run_fixes(self, steps: Sequence[str]) -> None:
+        passes = [self.make_pass(step) for step in steps]
+        counter = TokenCounter()
+        run_passes(self.clara.get('components', {}), passes + [counter])
+        self.metrics.count('tokens_visited', counter.visited)
+        for step, token_pass in zip(steps, passes):
+            if isinstance(token_pass, UnconvertedCheck):
+                self.report[step] = token_pass.unconverted
+            else:
+                self.report[step] = token_pass.fixes
+                self.metrics.count('fixes', token_pass.fixes)
+                self.clara_dirty = self.clara_dirty or token_pass.fixes > 0
+
+    def run_convert(self) -> None:
+        self.w3c_tokens = convert_flat_to_w3c(self.theme)
+        self.report['convert'] = len(self.theme)
+        self.metrics.count('tokens_visited', len(self.theme))
+
+    def run(self, steps: Sequence[str] = DEFAULT_STEPS, write: bool = True) -> Dict[str, Any]:
+        """Run `steps` in order, then write the outputs they changed. Return the report."""
+        unknown = [step for step in steps if step not in STEPS]
+        if unknown:
+            raise ValueError(f"Unknown steps: {', '.join(unknown)} (available: {', '.join(STEPS)})")
+
+        timings = self.report.setdefault('timings_ms', {})
+        for group in group_steps(steps):
+            name = '+'.join(group)
+            start = time.perf_counter()
+            with self.metrics.stage(name):
+                if group[0] == 'import':
+                    self.run_import()
+                elif group[0] == 'convert':
+                    self.run_convert()
+                else:
+                    self.run_fixes(group)
+            timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+        if write:
+            with self.metrics.stage('write'):
+                self.write()
+        return self.report
+
+    def write(self) -> List[str]:
+        """
+        Write clara-tokens.json if a step changed it and the converted theme
+        if any, skipping files whose content is unchanged. Return the paths
+        actually written.
+        """
+        written = []
+        if self.clara_dirty:
+            if self.metrics.write_json(self.clara_file, self._clara):
+                written.append(self.clara_file)
+            self.clara_dirty = False
+        if self.w3c_tokens is not None and self.output_file:
+            if self.metrics.write_json(self.output_file, self.w3c_tokens):
+                written.append(self.output_file)
+        self.report['written'] = written
+        return written
+
+
+def group_steps(steps: Sequence[str]) -> List[List[str]]:
+    """Split steps into runs, merging consecutive pass steps into one traversal."""
+    groups: List[List[str]] = []
+    for step in steps:
+        if step in PASS_STEPS and groups and groups[-1][0] in PASS_STEPS:
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def run_pipeline(steps: Sequence[str] = DEFAULT_STEPS, **options) -> Dict[str, Any]:
+    """Convenience wrapper: Pipeline(**options).run(steps)."""
+    return Pipeline(**options).run(steps)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m orbit_tokens',
+        description="Run the token pipeline steps in one process, on one parse of each file.",
+    )
+    parser.add_argument("--steps", default=','.join(DEFAULT_STEPS),
+                        help=f"comma-separated steps among {', '.join(STEPS)} (default: %(default)s)")
+    parser.add_argument("--theme", default="theme-mooneygo.json", help="flat theme file")
+    parser.add_argument("--clara", default="clara-tokens.json", help="clara-tokens.json file")
+    parser.add_argument("--output", default="theme-mooneygo-w3c.json", help="W3C output of the convert step")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the fixes (see --log-sample)")
+    add_arguments(parser)
+    parser.add_argument("--dry-run", action="store_true", help="run the steps without writing any file")
+    parser.add_argument("--watch", action="store_true", help="keep running and rebuild only what each edit touches")
+    parser.add_argument("--poll", action="store_true", help="with --watch, poll file stats instead of using inotify")
+    args = parser.parse_args(argv)
+    if args.watch and args.dry_run:
+        parser.error("--watch and --dry-run cannot be combined")
+
+    steps = [step.strip() for step in args.steps.split(',') if step.strip()]
+    log = print if args.verbose else None
+    metrics = Metrics(log, args.log_sample if args.verbose else 0)
+    pipeline = Pipeline(args.theme, args.clara, args.output, log=log, metrics=metrics)
+    if args.watch:
+        from .watch import watch
+
+        unknown = [step for step in steps if step not in STEPS]
+        if unknown:
+            parser.error(f"Unknown steps: {', '.join(unknown)}")
+        watch(pipeline, steps, poll=args.poll)
+        return
+    try:
+        report = pipeline.run(steps, write=not args.dry_run)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if 'import' in report:
+        imported = sum(1 for count in report['import'].values() if count)
+        print(f"📦 import: {imported}/{len(report['import'])} componenti, {sum(report['import'].values())} proprietà")
+    for step in ('fix-aliases', 'map-aliases', 'fix-types'):
+        if step in report:
+            print(f"🔧 {step}: {report[step]} correzioni")
+    if 'check' in report:
+        print(f"🔍 check: {len(report['check'])} alias ancora da convertire")
+        for item in report['check'][:10]:
+            print(f"  - {item}")
+    if 'convert' in report:
+        print(f"✓ convert: {report['convert']} token")
+    for group, ms in report['timings_ms'].items():
+        print(f"  {group:32} {ms:9.2f} ms")
+    for path, status in pipeline.metrics.files.items():
+        print(f"💾 {path}" if status == 'written' else f"💾 {path} invariato, nessuna scrittura")
+    metrics.save(args.metrics)
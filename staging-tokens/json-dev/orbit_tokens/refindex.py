@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Persisted reverse-reference index for impact analysis.
+
+For every indexed file the index stores the references of each token (the
+forward edges) together with the file's stat signature and content hash.
+From these it derives the reverse map: referenced token path → tokens that
+reference it directly. Transitive dependents are found by walking the
+reverse map breadth-first, which costs O(dependents) per query.
+
+Updates are incremental: only files whose signature and content changed are
+parsed again. Their old edges are dropped from the reverse map and the new
+ones added; the map is rebuilt from the stored edges, without parsing, only
+when a file adds or removes token paths (which may change how set-relative
+references such as "{colors.coffee.70}" resolve).
+
+    python -m orbit_tokens.refindex query '{global.colors.greyscale.3}'
+    python -m orbit_tokens.refindex query definitions.button.primary.background --direct
+    python -m orbit_tokens.refindex update clara-tokens.json template-w3c-linked.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .files import write_json_atomic
+from .resolve import build_lookup, find_references, iter_tokens
+
+INDEX_VERSION = 1
+DEFAULT_INDEX = 'token-refs.index.json'
+DEFAULT_FILES = (
+    'clara-tokens.json',
+    'template-w3c-linked.json',
+    '../orbit-audit.json',
+    '../orbit-audit-semantic.json',
+)
+
+# A dependent: (file, token path)
+Dependent = Tuple[str, str]
+
+
+def _signature(path: str) -> List[int]:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _strip_braces(ref: str) -> str:
+    return ref[1:-1] if ref.startswith('{') and ref.endswith('}') else ref
+
+
+class RefIndex:
+    """Forward references per file and the reverse map derived from them."""
+
+    def __init__(self, index_file: Optional[str] = None):
+        self.index_file = index_file
+        # file → {'signature', 'hash', 'refs': {token path: [reference paths]}}
+        self.files: Dict[str, Dict] = {}
+        self.lookup: Dict[str, str] = {}
+        self.reverse: Dict[str, List[Dependent]] = {}
+
+    @classmethod
+    def load(cls, index_file: str) -> 'RefIndex':
+        """Load a saved index; a missing or outdated file gives an empty one."""
+        index = cls(index_file)
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') != INDEX_VERSION:
+            return index
+        index.files = data['files']
+        index.reverse = {target: [tuple(dep) for dep in deps] for target, deps in data['reverse'].items()}
+        index.lookup = build_lookup(index._token_paths())
+        return index
+
+    def save(self, index_file: Optional[str] = None) -> int:
+        self.index_file = index_file or self.index_file
+        return write_json_atomic(self.index_file, {
+            'version': INDEX_VERSION,
+            'files': self.files,
+            'reverse': self.reverse,
+        }, indent=None, separators=(',', ':'))
+
+    def _token_paths(self) -> List[str]:
+        return [path for entry in self.files.values() for path in entry['refs']]
+
+    def target(self, ref: str) -> str:
+        """Token path a reference designates, or the reference itself when nothing defines it."""
+        ref = _strip_braces(ref)
+        return self.lookup.get(ref, ref)
+
+    def _add_edges(self, file: str) -> None:
+        for path, refs in self.files[file]['refs'].items():
+            for ref in refs:
+                self.reverse.setdefault(self.target(ref), []).append((file, path))
+
+    def _drop_edges(self, file: str) -> None:
+        for path, refs in self.files[file]['refs'].items():
+            for ref in refs:
+                target = self.target(ref)
+                deps = self.reverse.get(target)
+                if deps is None:
+                    continue
+                deps[:] = [dep for dep in deps if dep != (file, path)]
+                if not deps:
+                    del self.reverse[target]
+
+    def rebuild(self) -> None:
+        """Recompute the lookup and the reverse map from the stored forward edges."""
+        self.lookup = build_lookup(self._token_paths())
+        self.reverse = {}
+        for file in self.files:
+            self._add_edges(file)
+
+    def update(self, files: Iterable[str], prune: bool = True) -> List[str]:
+        """
+        Bring the index up to date with `files`; with `prune`, files indexed
+        before but not listed are dropped. Return the files that had to be
+        parsed again.
+        """
+        files = [os.path.normpath(file) for file in files]
+        changed: Dict[str, Optional[Dict]] = {}
+        if prune:
+            for file in set(self.files) - set(files):
+                changed[file] = None
+
+        for file in files:
+            entry = self.files.get(file)
+            signature = _signature(file)
+            if entry is not None and entry['signature'] == signature:
+                continue
+            with open(file, 'rb') as f:
+                data = f.read()
+            digest = _content_hash(data)
+            if entry is not None and entry['hash'] == digest:
+                entry['signature'] = signature
+                continue
+            refs = {}
+            for path, token in iter_tokens(json.loads(data)):
+                refs[path] = list(dict.fromkeys(find_references(token['$value'])))
+            changed[file] = {'signature': signature, 'hash': digest, 'refs': refs}
+
+        if not changed:
+            return []
+
+        # Same token paths: patch the reverse map. New or removed paths may
+        # change what relative references resolve to: rebuild it.
+        paths_changed = any(
+            new is None or file not in self.files or new['refs'].keys() != self.files[file]['refs'].keys()
+            for file, new in changed.items()
+        )
+        for file, new in changed.items():
+            if file in self.files and not paths_changed:
+                self._drop_edges(file)
+            if new is None:
+                del self.files[file]
+            else:
+                self.files[file] = new
+                if not paths_changed:
+                    self._add_edges(file)
+        if paths_changed:
+            self.rebuild()
+
+        return [file for file, new in changed.items() if new is not None]
+
+    def refresh(self) -> List[str]:
+        """Re-parse the indexed files that changed on disk; files that no longer exist are kept."""
+        return self.update([file for file in self.files if os.path.exists(file)], prune=False)
+
+    def collisions(self) -> Dict[str, List[str]]:
+        """Token paths defined by more than one indexed file → those files."""
+        owners: Dict[str, List[str]] = {}
+        for file, entry in self.files.items():
+            for path in entry['refs']:
+                owners.setdefault(path, []).append(file)
+        return {path: files for path, files in owners.items() if len(files) > 1}
+
+    def direct_dependents(self, ref: str) -> List[Dependent]:
+        return list(self.reverse.get(self.target(ref), ()))
+
+    def dependents(self, ref: str, transitive: bool = True) -> List[Tuple[str, str, int]]:
+        """
+        Tokens that depend on `ref`, as (file, token path, depth) where depth 1
+        is a direct reference. Breadth-first, each dependent listed once.
+        """
+        start = self.target(ref)
+        seen = {start}
+        result = []
+        queue = deque([(start, 0)])
+        while queue:
+            target, depth = queue.popleft()
+            for file, path in self.reverse.get(target, ()):
+                if (file, path) in seen:
+                    continue
+                seen.add((file, path))
+                result.append((file, path, depth + 1))
+                if transitive and path not in seen:
+                    seen.add(path)
+                    queue.append((path, depth + 1))
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(deps) for deps in self.reverse.values())
+
+
+def open_index(files: Optional[Iterable[str]] = None, index_file: str = DEFAULT_INDEX, save: bool = True) -> RefIndex:
+    """
+    Load the index, refresh it and save it if anything changed. Without
+    `files` the indexed files are refreshed (DEFAULT_FILES when the index is
+    empty); `files` (those that exist) are refreshed or added. Files are
+    only dropped by RefIndex.update().
+    """
+    index = RefIndex.load(index_file)
+    if files is None and index.files:
+        parsed = index.refresh()
+    else:
+        files = DEFAULT_FILES if files is None else files
+        parsed = index.update((file for file in files if os.path.exists(file)), prune=False)
+    if parsed and save:
+        index.save()
+    return index
+
+
+def impact(ref: str, files: Optional[Iterable[str]] = None, index_file: str = DEFAULT_INDEX,
+           transitive: bool = True) -> List[Tuple[str, str, int]]:
+    """Dependents of `ref`, using (and refreshing) the persisted index; see open_index()."""
+    return open_index(files, index_file).dependents(ref, transitive)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reverse-reference index of W3C token files.")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="index file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    update = commands.add_parser("update", help="index files, parsing only those that changed")
+    update.add_argument("files", nargs="*", help=f"default: {' '.join(DEFAULT_FILES)}")
+
+    query = commands.add_parser("query", help="list the tokens that depend on references")
+    query.add_argument("refs", nargs="+", help="token paths, with or without braces")
+    query.add_argument("--direct", action="store_true", help="direct dependents only")
+    query.add_argument("--files", nargs="+",
+                       help="files to refresh or add (default: the indexed files; use update to drop files)")
+    query.add_argument("--json", action="store_true", help="print the result as JSON")
+
+    args = parser.parse_args()
+
+    if args.command == "update":
+        files = args.files or [file for file in DEFAULT_FILES if os.path.exists(file)]
+        index = RefIndex.load(args.index)
+        parsed = index.update(files)
+        index.save()
+        print(f"✓ {args.index}: {len(index.files)} files, {len(index)} references ({len(parsed)} files parsed)")
+        for path, files in index.collisions().items():
+            print(f"⚠️  {path}: defined in {', '.join(files)}")
+        return
+
+    index = open_index(args.files, args.index)
+    results = {ref: index.dependents(ref, transitive=not args.direct) for ref in args.refs}
+    if args.json:
+        print(json.dumps({
+            ref: [{'file': file, 'path': path, 'depth': depth} for file, path, depth in deps]
+            for ref, deps in results.items()
+        }, indent=2, ensure_ascii=False))
+        return
+    for ref, deps in results.items():
+        print(f"{ref} → {index.target(ref)}: {len(deps)} dependents")
+        for file, path, depth in deps:
+            print(f"  {'  ' * (depth - 1)}{path}  ({file})")
+
+
+if __name__ == "__main__":
+    main()
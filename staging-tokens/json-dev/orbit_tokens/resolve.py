@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Alias resolution for W3C design token trees.
+
+References such as "{definitions.button.primary.background}" are resolved by
+building the reference graph once, ordering it topologically and resolving
+every token exactly once, so chains shared by many tokens are only walked a
+single time. Dangling references and cycles are collected in the same pass,
+along with the tokens blocked by a cycle (they reference one, directly or
+through other tokens), and token paths defined by more than one tree (the
+last definition wins) when the graph is built.
+
+Reference paths may be written either in full ("{global.colors.neutral.white}")
+or relative to their top-level set ("{colors.neutral.white}"), as in the
+orbit-audit files.
+"""
+
+import json
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+ALIAS_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+# Keys that describe a token rather than nesting further groups
+TOKEN_META_KEYS = ('$value', '$type', '$description')
+
+
+def iter_tokens(obj: Any, path: str = '') -> Iterator[Tuple[str, Dict]]:
+    """Yield (dotted path, token dict) for every node carrying a $value."""
+    if not isinstance(obj, dict):
+        return
+    if '$value' in obj:
+        yield path, obj
+    for key, value in obj.items():
+        if key not in TOKEN_META_KEYS and isinstance(value, dict):
+            yield from iter_tokens(value, f'{path}.{key}' if path else key)
+
+
+def find_references(value: Any) -> List[str]:
+    """Return every reference path appearing in a token value."""
+    if isinstance(value, str):
+        return ALIAS_PATTERN.findall(value) if '{' in value else []
+    if isinstance(value, dict):
+        return [ref for item in value.values() for ref in find_references(item)]
+    if isinstance(value, list):
+        return [ref for item in value for ref in find_references(item)]
+    return []
+
+
+def substitute_references(value: Any, lookup) -> Any:
+    """
+    Replace references in `value` using `lookup(ref)`, which returns the
+    resolved value or None when the reference cannot be resolved.
+
+    A value that is exactly one reference takes the referenced value as is;
+    references embedded in a longer string are interpolated as text.
+    Unresolvable references are left untouched.
+    """
+    if isinstance(value, str):
+        if '{' not in value:
+            return value
+        match = ALIAS_PATTERN.fullmatch(value)
+        if match:
+            resolved = lookup(match.group(1))
+            return value if resolved is None else resolved
+
+        def interpolate(m):
+            resolved = lookup(m.group(1))
+            return m.group(0) if resolved is None else str(resolved)
+
+        return ALIAS_PATTERN.sub(interpolate, value)
+    if isinstance(value, dict):
+        return {key: substitute_references(item, lookup) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute_references(item, lookup) for item in value]
+    return value
+
+
+def build_lookup(paths) -> Dict[str, str]:
+    """
+    Map every accepted reference path to the token path it designates.
+
+    Full paths win over set-relative ones; the first set declaring a
+    relative path wins over later ones.
+    """
+    lookup = {path: path for path in paths}
+    for path in paths:
+        relative = path.partition('.')[2]
+        if relative:
+            lookup.setdefault(relative, path)
+    return lookup
+
+
+class Resolution:
+    """Outcome of resolving a token graph."""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.dangling: Dict[str, List[str]] = {}
+        self.cycles: List[List[str]] = []
+        # token path → referenced tokens left unresolved by a cycle
+        self.blocked: Dict[str, List[str]] = {}
+        self.collisions: Dict[str, List[int]] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.dangling and not self.cycles and not self.blocked and not self.collisions
+
+
+class TokenGraph:
+    """Reference graph over the tokens of one or more W3C trees."""
+
+    def __init__(self, tokens: Dict[str, Dict], collisions: Optional[Dict[str, List[int]]] = None):
+        self.tokens = tokens
+        # token path → indices of the trees defining it, when more than one does
+        self.collisions = collisions or {}
+
+        self.lookup = build_lookup(tokens)
+
+        self.edges: Dict[str, List[str]] = {}
+        self.dangling: Dict[str, List[str]] = {}
+        for path, token in tokens.items():
+            targets = []
+            for ref in find_references(token['$value']):
+                target = self.lookup.get(ref)
+                if target is None:
+                    self.dangling.setdefault(path, []).append(ref)
+                else:
+                    targets.append(target)
+            if targets:
+                self.edges[path] = targets
+
+    @classmethod
+    def from_trees(cls, *trees: Dict) -> 'TokenGraph':
+        tokens: Dict[str, Dict] = {}
+        owners: Dict[str, int] = {}
+        collisions: Dict[str, List[int]] = {}
+        for index, tree in enumerate(trees):
+            for path, token in iter_tokens(tree):
+                if path in owners:
+                    collisions.setdefault(path, [owners[path]]).append(index)
+                owners[path] = index
+                tokens[path] = token
+        return cls(tokens, collisions)
+
+    def canonical(self, ref: str) -> Optional[str]:
+        """Map a reference path (with or without braces) to the token path it designates."""
+        if ref.startswith('{') and ref.endswith('}'):
+            ref = ref[1:-1]
+        return self.lookup.get(ref)
+
+    def topological_order(self) -> Tuple[List[str], List[List[str]]]:
+        """
+        Return (order, cycles): tokens ordered so that every token comes after
+        the tokens it references, and the reference cycles found on the way.
+        Tokens taking part in a cycle are left out of the order.
+        """
+        edges = self.edges
+        state: Dict[str, int] = {}  # 1 = on the stack, 2 = done
+        in_cycle = set()
+        order: List[str] = []
+        cycles: List[List[str]] = []
+
+        for root in self.tokens:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(edges.get(root, ())))]
+            on_stack = [root]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    child_state = state.get(child)
+                    if child_state is None:
+                        state[child] = 1
+                        stack.append((child, iter(edges.get(child, ()))))
+                        on_stack.append(child)
+                        break
+                    if child_state == 1:
+                        cycle = on_stack[on_stack.index(child):]
+                        cycles.append(cycle)
+                        in_cycle.update(cycle)
+                else:
+                    stack.pop()
+                    on_stack.pop()
+                    state[node] = 2
+                    if node not in in_cycle:
+                        order.append(node)
+
+        return order, cycles
+
+    def resolve(self) -> Resolution:
+        """
+        Resolve every token value, each one exactly once. Tokens in a cycle,
+        and those referencing a token that is not resolved in turn, are left
+        out of the values.
+        """
+        result = Resolution()
+        result.dangling = self.dangling
+        result.collisions = self.collisions
+        order, result.cycles = self.topological_order()
+
+        values = result.values
+        lookup = self.lookup
+
+        def resolved(ref):
+            target = lookup.get(ref)
+            return None if target is None else values.get(target)
+
+        for path in order:
+            targets = self.edges.get(path, ())
+            unresolved = [target for target in targets if target not in values]
+            if unresolved:
+                result.blocked[path] = unresolved
+                continue
+            value = self.tokens[path]['$value']
+            values[path] = substitute_references(value, resolved) if targets or path in self.dangling else value
+
+        return result
+
+
+def resolve_tokens(*trees: Dict) -> Resolution:
+    """Resolve all aliases across one or more W3C token trees."""
+    return TokenGraph.from_trees(*trees).resolve()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m orbit_tokens.resolve <tokens.json> [more.json ...]")
+        sys.exit(1)
+
+    trees = []
+    for input_file in sys.argv[1:]:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            trees.append(json.load(f))
+
+    graph = TokenGraph.from_trees(*trees)
+    result = graph.resolve()
+
+    print(f"Resolved {len(result.values)} of {len(graph.tokens)} tokens")
+    for path, refs in result.dangling.items():
+        print(f"  ✗ {path}: dangling {', '.join('{' + ref + '}' for ref in refs)}")
+    for cycle in result.cycles:
+        print(f"  ✗ cycle: {' → '.join(cycle + cycle[:1])}")
+    for path, targets in result.blocked.items():
+        print(f"  ✗ {path}: blocked by {', '.join(targets)}")
+    for path, owners in result.collisions.items():
+        files = ', '.join(sys.argv[1 + index] for index in owners)
+        print(f"  ✗ {path}: defined in {files} (the last one wins)")
+
+    sys.exit(0 if result.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
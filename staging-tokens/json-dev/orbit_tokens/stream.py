@@ -0,0 +1,226 @@
+"""
+Streaming flat → W3C conversion with bounded memory.
+
+The flat JSON object is read incrementally, one key/value pair at a time, and
+nested W3C groups are written out as soon as they are complete. When the
+input keys are grouped (every key sharing a dotted prefix is contiguous, as
+in sorted files or the theme files in this folder) this is a single pass and
+the output is identical to json.dump(convert_flat_to_w3c(...), indent=2).
+
+Ungrouped input is detected on the fly; the conversion then falls back to an
+external sort: pairs are sorted in bounded chunks spilled to temporary files
+and merged back in path order, so memory stays proportional to the chunk
+size rather than to the theme.
+
+The output is written to a temporary file and only replaces the previous
+one when the content differs.
+"""
+
+import heapq
+import json
+import tempfile
+from typing import IO, Any, Iterator, List, Tuple
+
+from .files import atomic_output
+from .w3c import make_token
+
+READ_CHUNK = 1 << 16
+SORT_CHUNK_ROWS = 100_000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class GroupingError(ValueError):
+    """Raised when a group is reopened after it was already written out."""
+
+
+def iter_flat_pairs(fp: IO[str], chunk_size: int = READ_CHUNK) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) pairs of a flat JSON object without loading it whole."""
+    buf = ''
+    pos = 0
+    eof = False
+
+    def more():
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            more()
+
+    def expect(chars):
+        nonlocal pos
+        skip_whitespace()
+        if pos >= len(buf) or buf[pos] not in chars:
+            found = buf[pos:pos + 20] if pos < len(buf) else 'end of file'
+            raise ValueError(f"Expected {' or '.join(repr(c) for c in chars)}, found {found!r}")
+        pos += 1
+        return buf[pos - 1]
+
+    def decode():
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+            # A number at the very end of the buffer may be cut in half
+            if not eof and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                more()
+                continue
+            pos = end
+            return value
+
+    more()
+    expect('{')
+    skip_whitespace()
+    if pos < len(buf) and buf[pos] == '}':
+        return
+    while True:
+        key = decode()
+        expect(':')
+        yield key, decode()
+        if expect(',}') == '}':
+            return
+
+
+class W3CStreamWriter:
+    """Write nested W3C groups incrementally from tokens arriving in grouped order."""
+
+    def __init__(self, fp: IO[str], indent: int = 2):
+        self.fp = fp
+        self.indent = ' ' * indent
+        self.stack: List[str] = []
+        self.first = [True]
+        self.closed = set()
+        fp.write('{')
+
+    def _entry(self, key: str) -> None:
+        depth = len(self.stack) + 1
+        self.fp.write(('\n' if self.first[-1] else ',\n') + self.indent * depth + _encode(key) + ': ')
+        self.first[-1] = False
+
+    def _encode_token(self, token: Any, depth: int) -> str:
+        """Same text as json.dumps(token, indent=...) re-indented to `depth`, on the C encoder where possible."""
+        pad = '\n' + self.indent * depth
+        if not isinstance(token, dict) or not token:
+            return json.dumps(token, indent=self.indent, ensure_ascii=False).replace('\n', pad)
+        inner = pad + self.indent
+        parts = []
+        for key, value in token.items():
+            if isinstance(value, (dict, list)) and value:
+                text = json.dumps(value, indent=self.indent, ensure_ascii=False).replace('\n', inner)
+            else:
+                text = _encode(value)
+            parts.append(_encode(key) + ': ' + text)
+        return '{' + inner + (',' + inner).join(parts) + pad + '}'
+
+    def _close_group(self) -> None:
+        self.closed.add(tuple(self.stack))
+        self.stack.pop()
+        empty = self.first.pop()
+        self.fp.write('}' if empty else '\n' + self.indent * (len(self.stack) + 1) + '}')
+
+    def write_token(self, path: List[str], token: Any) -> None:
+        groups = path[:-1]
+        common = 0
+        while common < len(self.stack) and common < len(groups) and self.stack[common] == groups[common]:
+            common += 1
+        while len(self.stack) > common:
+            self._close_group()
+        for part in groups[common:]:
+            if tuple(self.stack) + (part,) in self.closed:
+                raise GroupingError(f"Group {'.'.join(self.stack + [part])} reopened; input keys are not grouped")
+            self._entry(part)
+            self.fp.write('{')
+            self.stack.append(part)
+            self.first.append(True)
+
+        self._entry(path[-1])
+        self.fp.write(self._encode_token(token, len(self.stack) + 1))
+
+    def close(self) -> None:
+        while self.stack:
+            self._close_group()
+        self.fp.write('}' if self.first[0] else '\n}')
+
+
+def _sorted_pairs(pairs: Iterator[Tuple[str, Any]], chunk_rows: int) -> Iterator[Tuple[str, Any]]:
+    """External sort of (key, value) pairs by dotted path, in chunks of `chunk_rows`."""
+    spill_files = []
+    try:
+        chunk = []
+
+        def spill():
+            chunk.sort(key=lambda pair: pair[0].split('.'))
+            spill = tempfile.TemporaryFile('w+', encoding='utf-8')
+            for key, value in chunk:
+                spill.write(json.dumps([key, value], ensure_ascii=False) + '\n')
+            spill.seek(0)
+            spill_files.append(spill)
+            chunk.clear()
+
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) >= chunk_rows:
+                spill()
+        if chunk:
+            spill()
+
+        streams = [(tuple(json.loads(line)) for line in spill) for spill in spill_files]
+        previous = None
+        for pair in heapq.merge(*streams, key=lambda pair: pair[0].split('.')):
+            # Duplicate keys: the last occurrence wins, as with json.load
+            if previous is not None and previous[0] != pair[0]:
+                yield previous
+            previous = pair
+        if previous is not None:
+            yield previous
+    finally:
+        for spill in spill_files:
+            spill.close()
+
+
+def _write_tokens(pairs: Iterator[Tuple[str, Any]], fp: IO[str]) -> int:
+    writer = W3CStreamWriter(fp)
+    count = 0
+    for flat_key, value in pairs:
+        writer.write_token(flat_key.split('.'), make_token(value, flat_key))
+        count += 1
+    writer.close()
+    return count
+
+
+def stream_convert(input_file: str, output_file: str, chunk_rows: int = SORT_CHUNK_ROWS) -> Tuple[int, bool]:
+    """
+    Convert a flat theme file to a W3C file without holding either in memory.
+    Return (number of tokens, written): an output that already holds the
+    same content is left untouched.
+    """
+    output = atomic_output(output_file, if_changed=True)
+    with output as dst:
+        try:
+            with open(input_file, 'r', encoding='utf-8') as src:
+                count = _write_tokens(iter_flat_pairs(src), dst)
+        except GroupingError:
+            dst.seek(0)
+            dst.truncate()
+            with open(input_file, 'r', encoding='utf-8') as src:
+                count = _write_tokens(_sorted_pairs(iter_flat_pairs(src), chunk_rows), dst)
+    return count, output.written
@@ -0,0 +1,180 @@
+"""
+Synthetic token sets for benchmarking, shaped like the real files.
+
+generate_flat_theme() builds a flat theme in the style of theme-mooneygo.json:
+a palette under colors.*, then component keys such as
+UIButton7.roles.primary.backgroundColor whose values are palette names,
+hardcoded theme names (GREYSCALE_2, WHITE...), hex colors and numbers.
+
+generate_token_set() builds a W3C document in the style of clara-tokens.json
+and the orbit-audit files: global literals, semantic tokens aliasing each
+other `alias_depth` levels deep with per-brand $value maps, and components
+whose values mix aliases and hardcoded names for the fix scripts to convert.
+
+Both are deterministic for a given seed.
+"""
+
+import random
+from typing import Any, Dict, List, Sequence
+
+from .fixes import ALIAS_MAP
+
+BRANDS = ('orbit', 'mooney', 'agi', 'comersud')
+
+COMPONENT_NAMES = (
+    'Accordion', 'Button', 'Card', 'Checkbox', 'Counter', 'InfoFlag', 'Modal', 'Pin',
+    'TabBar', 'Tag', 'Text', 'TextInput', 'Toast', 'Toggle',
+)
+GROUPS = ('roles', 'sizes', 'states')
+VARIANTS = ('primary', 'secondary', 'tertiary', 'small', 'medium', 'big', 'disabled', 'error')
+
+COLOR_PROPS = ('backgroundColor', 'borderColor', 'textColor', 'iconColor', 'labelColor')
+DIMENSION_PROPS = ('height', 'width', 'size', 'paddingTop', 'paddingBottom', 'paddingHorizontal', 'gap', 'borderWidth')
+OTHER_PROPS = ('borderRadius', 'fontWeight', 'opacity', 'role')
+
+THEME_NAMES = [name for name in ALIAS_MAP if name != 'NONE']
+RADIUS_NAMES = ('XS', 'S', 'M', 'L', 'XL', 'XXL')
+ROLES = ('h1', 'h2', 'h3', 'body1', 'body2', 'caption')
+
+# Share of the flat theme taken by the colors.* palette (about 7% in theme-mooneygo.json)
+PALETTE_SHARE = 0.07
+
+
+def _hex(rng: random.Random) -> str:
+    return '#%06X' % rng.randrange(0x1000000)
+
+
+def _component_keys(count: int) -> List[str]:
+    """Unique dotted component keys, grouped by component like the real themes."""
+    keys: List[str] = []
+    props = COLOR_PROPS + DIMENSION_PROPS + OTHER_PROPS
+    component = 0
+    while len(keys) < count:
+        name = f'UI{COMPONENT_NAMES[component % len(COMPONENT_NAMES)]}{component}'
+        for group in GROUPS:
+            for variant in VARIANTS:
+                for prop in props:
+                    keys.append(f'{name}.{group}.{variant}.{prop}')
+        # A few shallow keys per component, as in ScreenX.someColor
+        for prop in COLOR_PROPS:
+            keys.append(f'{name}.{prop}')
+        component += 1
+    return keys[:count]
+
+
+def _flat_value(rng: random.Random, prop: str, palette: Sequence[str]) -> Any:
+    if prop in COLOR_PROPS:
+        roll = rng.random()
+        if roll < 0.45:
+            return rng.choice(THEME_NAMES)
+        if roll < 0.85:
+            return rng.choice(palette)
+        return _hex(rng)
+    if prop in DIMENSION_PROPS:
+        return rng.choice((0, 1, 2, 4, 8, 12, 16, 20, 24, 32, 48))
+    if prop == 'borderRadius':
+        return rng.choice(RADIUS_NAMES) if rng.random() < 0.6 else rng.choice((0, 4, 8, 16))
+    if prop == 'fontWeight':
+        return rng.choice(('400', '500', '700'))
+    if prop == 'opacity':
+        return rng.choice((0.3, 0.5, 0.8, 1))
+    return rng.choice(ROLES)
+
+
+def generate_flat_theme(tokens: int, seed: int = 0) -> Dict[str, Any]:
+    """Flat theme of `tokens` keys shaped like theme-mooneygo.json."""
+    rng = random.Random(seed)
+    palette_size = max(1, int(tokens * PALETTE_SHARE))
+    palette = [f'BRAND_COLOR_{i}' for i in range(palette_size)]
+
+    theme: Dict[str, Any] = {f'colors.{name}': _hex(rng) for name in palette}
+    for key in _component_keys(tokens - len(theme)):
+        theme[key] = _flat_value(rng, key.rsplit('.', 1)[-1], palette)
+    return theme
+
+
+def _brand_map(brands: Sequence[str], pick) -> Dict[str, Any]:
+    return {brand: pick() for brand in brands}
+
+
+def generate_token_set(
+    tokens: int,
+    alias_depth: int = 3,
+    brands: Sequence[str] = BRANDS,
+    seed: int = 0,
+) -> Dict[str, Dict]:
+    """
+    W3C document of about `tokens` tokens: {"global", "semantic", "components"}.
+
+    Global tokens are literals. Semantic tokens form `alias_depth` levels,
+    level 1 aliasing global tokens and level N aliasing level N-1, each with a
+    per-brand $value map. Component tokens (the bulk, about 80%) alias
+    semantic tokens or still hold hardcoded theme names, and some carry a
+    $type that disagrees with their alias.
+    """
+    rng = random.Random(seed)
+    global_count = max(len(THEME_NAMES), tokens // 10)
+    semantic_count = max(alias_depth, tokens // 10)
+    component_count = max(0, tokens - global_count - semantic_count)
+
+    # Global literals, including the targets of ALIAS_MAP
+    global_tokens: Dict[str, Dict] = {'colors': {}, 'radius': {}}
+    global_paths: List[str] = []
+    for alias in dict.fromkeys(ALIAS_MAP.values()):
+        parts = alias.strip('{}').split('.')
+        if parts[0] != 'global':
+            continue
+        group = global_tokens
+        for part in parts[1:-1]:
+            group = group.setdefault(part, {})
+        is_radius = parts[1] == 'radius'
+        group[parts[-1]] = {'$value': rng.choice((4, 8, 12)) if is_radius else _hex(rng),
+                            '$type': 'borderRadius' if is_radius else 'color'}
+        global_paths.append('.'.join(parts))
+    palette = global_tokens['colors'].setdefault('palette', {})
+    for i in range(global_count - len(global_paths)):
+        palette[str(i)] = {'$value': _hex(rng), '$type': 'color'}
+        global_paths.append(f'global.colors.palette.{i}')
+
+    # Semantic levels: each aliases the previous one, per brand
+    semantic_tokens: Dict[str, Dict] = {}
+    previous = global_paths
+    per_level = max(1, semantic_count // alias_depth)
+    semantic_paths: List[str] = []
+    for level in range(1, alias_depth + 1):
+        group = semantic_tokens.setdefault(f'level{level}', {})
+        current = []
+        for i in range(per_level):
+            group[str(i)] = {
+                '$value': _brand_map(brands, lambda: '{%s}' % rng.choice(previous)),
+                '$type': 'color',
+            }
+            current.append(f'semantic.level{level}.{i}')
+        semantic_paths.extend(current)
+        previous = current
+
+    # Components: aliases to semantic tokens or hardcoded theme names
+    components: Dict[str, Dict] = {}
+    for key in _component_keys(component_count):
+        parts = key.split('.')
+        prop = parts[-1]
+        group = components
+        for part in parts[:-1]:
+            group = group.setdefault(part, {})
+        if prop in COLOR_PROPS:
+            roll = rng.random()
+            if roll < 0.4:
+                token = {'$value': rng.choice(THEME_NAMES), '$type': 'color'}
+            elif roll < 0.9:
+                token = {'$value': '{%s}' % rng.choice(semantic_paths), '$type': 'color'}
+            else:
+                token = {'$value': _hex(rng), '$type': 'color'}
+        elif prop == 'borderRadius':
+            # Studio exports radius aliases as spacing: fix-types-by-alias corrects them
+            token = {'$value': rng.choice(RADIUS_NAMES), '$type': 'spacing'}
+        else:
+            token = {'$value': _flat_value(rng, prop, ()), '$type': 'spacing'}
+        group[prop] = token
+
+    return {'global': global_tokens, 'semantic': semantic_tokens, 'components': components}
+
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Canonical token values and value-indexed alias discovery.
+
+The same color is written in many ways across the theme files: "#BBB",
+"#BBBBBB", "#bbbbbbff", "rgba(187, 187, 187, 1)". canonical_value() reduces
+a value to a hashable key: colors to a packed 0xRRGGBBAA integer,
+dimensions ("16px", "1rem", 16, {"value": 16, "unit": "px"}) to pixels.
+
+A ValueIndex maps those keys to the global/semantic token paths holding
+the value, so a hardcoded value in a component is matched to its alias
+candidates with one dict lookup. Hardcoded theme names (GREYSCALE_3, XS...)
+are first looked up in the flat theme (colors.GREYSCALE_3 → "#BBBBBB") and
+then matched the same way. This replaces hand-maintaining ALIAS_MAP; the
+map is only kept as a fallback for names the index cannot match.
+
+    python -m orbit_tokens.values clara-tokens.json --theme theme-mooneygo.json
+"""
+
+import argparse
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .brands import BrandTable
+from .resolve import TokenGraph, iter_tokens
+
+# Key of the canonical value: ('color', 0xRRGGBBAA) or ('dimension', pixels)
+ValueKey = Tuple[str, Any]
+
+HEX_COLOR = re.compile(r'#([0-9A-Fa-f]{3,4}|[0-9A-Fa-f]{6}|[0-9A-Fa-f]{8})')
+RGB_COLOR = re.compile(
+    r'rgba?\(\s*([\d.]+%?)\s*[, ]\s*([\d.]+%?)\s*[, ]\s*([\d.]+%?)\s*(?:[,/]\s*([\d.]+%?)\s*)?\)'
+)
+DIMENSION = re.compile(r'(-?\d+(?:\.\d+)?)\s*(px|rem|em)?')
+# Hardcoded theme names: GREYSCALE_3, MOONEYGO_PRIMARY_3, XS...
+THEME_NAME = re.compile(r'[A-Z][A-Z0-9_]*')
+
+REM_PX = 16
+NAMED_COLORS = {'transparent': 0x00000000, 'white': 0xFFFFFFFF, 'black': 0x000000FF}
+
+DIMENSION_TYPES = ('dimension', 'spacing', 'borderRadius', 'sizing', 'borderWidth')
+
+# Sections of the flat theme where a hardcoded name is looked up, by kind of token
+NAME_SECTIONS = {
+    'color': ('colors',),
+    'radius': ('borderRadii', 'spacings'),
+    'dimension': ('spacings', 'borderRadii'),
+}
+_NAME_SECTIONS = {section for sections in NAME_SECTIONS.values() for section in sections}
+
+
+def _channel(text: str, scale: int = 255) -> int:
+    if text.endswith('%'):
+        return round(float(text[:-1]) * 255 / 100)
+    value = float(text)
+    return round(value * 255) if scale == 1 else round(value)
+
+
+def parse_color(value: Any) -> Optional[int]:
+    """Packed 0xRRGGBBAA for a hex, rgb()/rgba() or named color string, else None."""
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    match = HEX_COLOR.fullmatch(text)
+    if match:
+        digits = match.group(1)
+        if len(digits) <= 4:
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) == 6:
+            digits += 'ff'
+        return int(digits, 16)
+    match = RGB_COLOR.fullmatch(text.lower())
+    if match:
+        r, g, b, a = match.groups()
+        alpha = 255 if a is None else _channel(a, scale=1)
+        channels = [min(255, max(0, _channel(c))) for c in (r, g, b)] + [min(255, max(0, alpha))]
+        return (channels[0] << 24) | (channels[1] << 16) | (channels[2] << 8) | channels[3]
+    return NAMED_COLORS.get(text.lower())
+
+
+def format_color(rgba: int) -> str:
+    """#rrggbb, or #rrggbbaa when not opaque."""
+    return f'#{rgba >> 8:06x}' if rgba & 0xFF == 0xFF else f'#{rgba:08x}'
+
+
+def parse_dimension(value: Any) -> Optional[float]:
+    """Pixels for a number, a "16px"/"1rem" string or a {"value", "unit"} object, else None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict) and 'value' in value:
+        unit = value.get('unit', 'px')
+        number = value['value']
+        if isinstance(number, (int, float)) and unit in ('px', 'rem', 'em'):
+            return float(number) * (REM_PX if unit != 'px' else 1)
+        return None
+    if isinstance(value, str):
+        match = DIMENSION.fullmatch(value.strip())
+        if match:
+            number = float(match.group(1))
+            return number * REM_PX if match.group(2) in ('rem', 'em') else number
+    return None
+
+
+def _is_unitless(value: Any) -> bool:
+    """A bare number, or a string holding one ("0", "16")."""
+    if isinstance(value, str):
+        match = DIMENSION.fullmatch(value.strip())
+        return match is not None and match.group(2) is None
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def is_theme_name(value: Any) -> bool:
+    """True for a hardcoded theme name such as GREYSCALE_3 (not "#BBB" nor "16")."""
+    return (
+        isinstance(value, str) and THEME_NAME.fullmatch(value) is not None
+        and parse_color(value) is None and parse_dimension(value) is None
+    )
+
+
+def canonical_value(value: Any, token_type: Optional[str] = None) -> Optional[ValueKey]:
+    """
+    Hashable canonical form of a literal value, or None for aliases and
+    values that are neither colors nor dimensions. Unitless numbers (16 or
+    "16") count as dimensions only for dimension-like $types.
+    """
+    if isinstance(value, str) and '{' in value:
+        return None
+    rgba = parse_color(value)
+    if rgba is not None:
+        return ('color', rgba)
+    if token_type not in DIMENSION_TYPES and _is_unitless(value):
+        return None
+    pixels = parse_dimension(value)
+    if pixels is not None:
+        return ('dimension', pixels)
+    return None
+
+
+def token_kind(key: str, token_type: Optional[str]) -> str:
+    """'color', 'radius' or 'dimension': where a hardcoded name of this token is looked up."""
+    lowered = key.lower()
+    if token_type == 'borderRadius' or 'radius' in lowered:
+        return 'radius'
+    if token_type == 'color' or 'color' in lowered:
+        return 'color'
+    return 'dimension'
+
+
+class ValueIndex:
+    """Canonical value → token paths holding it, in preference order."""
+
+    def __init__(self, prefer: Sequence[str] = ('global', 'semantic')):
+        self.prefer = tuple(prefer)
+        self.paths: Dict[ValueKey, List[str]] = {}
+        self.types: Dict[str, Optional[str]] = {}
+        self.names: Dict[str, Any] = {}
+
+    def _rank(self, path: str) -> Tuple[int, int]:
+        root = path.split('.', 1)[0]
+        return (self.prefer.index(root) if root in self.prefer else len(self.prefer), path.count('.'))
+
+    def add(self, path: str, value: Any, token_type: Optional[str] = None) -> None:
+        key = canonical_value(value, token_type)
+        if key is None:
+            return
+        self.paths.setdefault(key, []).append(path)
+        self.types[path] = token_type
+
+    def add_tokens(self, tokens: Dict[str, Dict], values: Dict[str, Any]) -> None:
+        """Index `values` ({path: resolved value}) of `tokens`, then sort candidates by preference."""
+        for path, value in values.items():
+            # Unresolved brand maps have no canonical form and are skipped by add()
+            self.add(path, value, tokens[path].get('$type'))
+        for paths in self.paths.values():
+            paths.sort(key=self._rank)
+
+    @classmethod
+    def from_trees(cls, *trees: Dict, brand: Optional[str] = None,
+                   prefer: Sequence[str] = ('global', 'semantic')) -> 'ValueIndex':
+        """
+        Index the resolved values of every token of `trees`. Multi-brand
+        $value maps are indexed with the value of `brand` (or skipped).
+        """
+        index = cls(prefer)
+        graph = TokenGraph.from_trees(*trees)
+        if brand is not None and any(isinstance(t['$value'], dict) for t in graph.tokens.values()):
+            table = BrandTable(graph, [brand])
+            values = table.brand_tokens(brand)
+        else:
+            values = graph.resolve().values
+        index.add_tokens(graph.tokens, values)
+        return index
+
+    def add_theme_names(self, flat_theme: Dict[str, Any]) -> None:
+        """Learn the hardcoded names of a flat theme (colors.GREYSCALE_3 → GREYSCALE_3)."""
+        for flat_key, value in flat_theme.items():
+            section, _, name = flat_key.partition('.')
+            if name and '.' not in name and section in _NAME_SECTIONS:
+                self.names[flat_key] = value
+
+    def lookup_name(self, name: str, kind: str) -> Any:
+        for section in NAME_SECTIONS[kind]:
+            flat_key = f'{section}.{name}'
+            if flat_key in self.names:
+                return self.names[flat_key]
+        return None
+
+    def candidates(self, value: Any, token_type: Optional[str] = None, key: str = '') -> List[str]:
+        """
+        Token paths whose value equals `value`, best first (same $type, then
+        preferred set, then shallowest path). Hardcoded theme names are
+        looked up in the flat theme first.
+        """
+        literal = value
+        if is_theme_name(value):
+            kind = token_kind(key, token_type)
+            literal = self.lookup_name(value, kind)
+            if literal is None:
+                return []
+            if kind != 'color':
+                token_type = 'borderRadius' if kind == 'radius' else 'dimension'
+        canonical = canonical_value(literal, token_type)
+        if canonical is None:
+            return []
+        paths = self.paths.get(canonical, [])
+        if token_type is None:
+            return list(paths)
+        same_type = [path for path in paths if self.types[path] == token_type]
+        return same_type + [path for path in paths if self.types[path] != token_type]
+
+    def alias(self, value: Any, token_type: Optional[str] = None, key: str = '') -> Optional[str]:
+        """Best alias ("{path}") for a hardcoded value, or None."""
+        paths = self.candidates(value, token_type, key)
+        return '{%s}' % paths[0] if paths else None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+def index_sets(document: Dict, skip: Iterable[str] = ('components',)) -> Dict:
+    """The token sets of a clara-tokens.json-like document that aliases may target."""
+    return {name: tree for name, tree in document.items() if name not in skip and isinstance(tree, dict)}
+
+
+def alias_index(document: Dict, flat_theme: Optional[Dict[str, Any]] = None) -> ValueIndex:
+    """ValueIndex of the sets of `document` that aliases may target, knowing the names of `flat_theme`."""
+    index = ValueIndex.from_trees(index_sets(document))
+    if flat_theme is not None:
+        index.add_theme_names(flat_theme)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discover aliases for hardcoded values by canonical value.")
+    parser.add_argument("tokens_file", help="W3C file with the sets to alias to (e.g. clara-tokens.json)")
+    parser.add_argument("--theme", default="theme-mooneygo.json", help="flat theme defining the hardcoded names")
+    parser.add_argument("--brand", help="brand to index in multi-brand $value maps")
+    args = parser.parse_args()
+
+    with open(args.tokens_file, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    with open(args.theme, 'r', encoding='utf-8') as f:
+        theme = json.load(f)
+
+    index = ValueIndex.from_trees(index_sets(document), brand=args.brand)
+    index.add_theme_names(theme)
+    print(f"Indexed {len(index)} tokens under {len(index.paths)} distinct values")
+
+    components = document.get('components', {})
+    found = missing = 0
+    for path, token in iter_tokens(components, 'components'):
+        value = token['$value']
+        if not isinstance(value, str) or '{' in value:
+            continue
+        alias = index.alias(value, token.get('$type'), path.rsplit('.', 1)[-1])
+        if alias:
+            found += 1
+            print(f"  {path}: {value} → {alias}")
+        elif is_theme_name(value) or parse_color(value) is not None:
+            missing += 1
+            print(f"  ✗ {path}: {value}")
+    print(f"✓ {found} aliases discovered, {missing} hardcoded values without a match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Conversion of flat design tokens to the W3C Design Tokens Format Module.
+"""
+
+from typing import Any, Dict, Optional
+
+from .inference import w3c_types
+
+
+def is_flat_theme(document: Dict) -> bool:
+    """Flat themes have dotted keys at the top level; W3C trees nest groups."""
+    return any('.' in key for key in document)
+
+
+def infer_token_type(key: str, value: Any) -> str:
+    """Infer the W3C token type based on key and value."""
+    return w3c_types.infer(key, value)
+
+
+def set_nested_value(obj: Dict, path: list, value: Any, original_key: str, describe: bool = True,
+                     token_type: Optional[str] = None) -> None:
+    """Set a value in a nested dictionary using a path."""
+    for key in path[:-1]:
+        if key not in obj:
+            obj[key] = {}
+        obj = obj[key]
+
+    obj[path[-1]] = make_token(value, original_key, describe, token_type)
+
+
+def make_token(value: Any, original_key: str, describe: bool = True, token_type: Optional[str] = None) -> Dict:
+    """Build the W3C token for a flat key/value pair (`token_type` is inferred when not given)."""
+    # Infer type
+    if token_type is None:
+        token_type = infer_token_type(original_key, value)
+
+    # Create W3C token structure
+    token = {
+        "$value": value,
+        "$type": token_type
+    }
+
+    # Add description with original flat key for reference
+    if describe:
+        token["$description"] = f"Original key: {original_key}"
+    return token
+
+
+def remove_nested_value(obj: Dict, path: list) -> bool:
+    """Remove the token at `path`, pruning groups left empty. Return True if it existed."""
+    parents = []
+    for key in path[:-1]:
+        if not isinstance(obj.get(key), dict):
+            return False
+        parents.append((obj, key))
+        obj = obj[key]
+
+    if path[-1] not in obj:
+        return False
+    del obj[path[-1]]
+
+    for parent, key in reversed(parents):
+        if parent[key]:
+            break
+        del parent[key]
+    return True
+
+
+def convert_flat_to_w3c(flat_tokens: Dict, describe: bool = True) -> Dict:
+    """Convert flat token structure to W3C nested structure."""
+    w3c_tokens = {}
+
+    for flat_key, value in flat_tokens.items():
+        # Split by dots to create hierarchy
+        path = flat_key.split('.')
+        set_nested_value(w3c_tokens, path, value, flat_key, describe)
+
+    return w3c_tokens
+
+
+def _subtree_types(group: Dict, types: Dict[int, set]) -> set:
+    """Collect the $type of every token below `group`, memoized by group id."""
+    found = set()
+    for key, child in group.items():
+        if key.startswith('$') or not isinstance(child, dict):
+            continue
+        if '$value' in child:
+            found.add(child.get('$type'))
+        else:
+            found |= _subtree_types(child, types)
+    types[id(group)] = found
+    return found
+
+
+def _hoist(group: Dict, inherited, types: Dict[int, set]) -> Dict:
+    own = types[id(group)]
+    result = {}
+    if len(own) == 1 and None not in own:
+        group_type = next(iter(own))
+        if group_type != inherited:
+            result['$type'] = group_type
+        inherited = group_type
+
+    for key, child in group.items():
+        if key.startswith('$') or not isinstance(child, dict):
+            result[key] = child
+        elif '$value' in child:
+            if child.get('$type') == inherited:
+                child = {k: v for k, v in child.items() if k != '$type'}
+            result[key] = child
+        else:
+            result[key] = _hoist(child, inherited, types)
+    return result
+
+
+def hoist_types(w3c_tokens: Dict) -> Dict:
+    """
+    Move a $type shared by every token of a group up to the group, as the
+    W3C format allows (tokens inherit the closest group $type), and drop it
+    from the tokens. Return the compacted tree.
+    """
+    types: Dict[int, set] = {}
+    _subtree_types(w3c_tokens, types)
+    return _hoist(w3c_tokens, None, types)
+
+
+def expand_types(w3c_tokens: Dict, inherited=None) -> None:
+    """Inverse of hoist_types: copy inherited group $type onto every token, in place."""
+    group_type = w3c_tokens.get('$type', inherited)
+    for key, child in w3c_tokens.items():
+        if key.startswith('$') or not isinstance(child, dict):
+            continue
+        if '$value' in child:
+            if '$type' not in child and group_type is not None:
+                child['$type'] = group_type
+        else:
+            expand_types(child, group_type)
+
+
+def strip_descriptions(w3c_tokens: Dict) -> None:
+    """Drop every token $description, in place."""
+    for key, child in w3c_tokens.items():
+        if key.startswith('$') or not isinstance(child, dict):
+            continue
+        if '$value' in child:
+            child.pop('$description', None)
+        else:
+            strip_descriptions(child)
+
+
+def provenance_index(source_file: str, flat_tokens: Dict) -> Dict:
+    """
+    Side-car replacing the per-token "Original key" descriptions: the source
+    file and its keys in their original order (each key is also the token's
+    dotted path in the W3C tree).
+    """
+    return {'source': source_file, 'keys': list(flat_tokens)}
@@ -0,0 +1,308 @@
+"""
+Watch mode: keep the pipeline state in memory and rebuild only what an edit touches.
+
+After one full run, the theme and clara-tokens.json are watched (inotify on
+Linux, stat polling elsewhere or with --poll). On a change:
+
+- theme: the new file is diffed key by key against the previous one. Only
+  the components whose prefix covers a touched key are re-extracted and
+  re-fixed, and only the touched keys are patched into the W3C tree (keys
+  added since the last build go at the end of their group, as with
+  --incremental).
+- clara-tokens.json: only the components that differ from the last build
+  are re-fixed; the file is written back only if a fix changed something.
+
+Writes made by the watcher itself are recognized and do not trigger a rebuild.
+
+    python -m orbit_tokens --watch [--steps ...] [--poll]
+"""
+
+import copy
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .components import import_components
+from .passes import run_passes
+from .pipeline import PASS_STEPS, Pipeline
+from .w3c import remove_nested_value, set_nested_value
+
+POLL_INTERVAL = 0.5
+# Editors save in bursts (truncate + write, or write temp + rename)
+DEBOUNCE = 0.05
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT = struct.Struct('iIII')
+
+_MISSING = object()
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """Detect changes by comparing stat signatures every `interval` seconds."""
+
+    def __init__(self, paths: Iterable[str], interval: float = POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.signatures = {path: file_signature(path) for path in self.paths}
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                signature = file_signature(path)
+                if signature != self.signatures[path]:
+                    self.signatures[path] = signature
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify through ctypes. Parent directories are watched, so files
+    replaced by rename (atomic saves) are still seen.
+    """
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = {os.path.abspath(path) for path in paths}
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs: Dict[int, str] = {}
+        for directory in {os.path.dirname(path) for path in self.paths}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed on {directory}')
+            self.dirs[wd] = directory
+
+    def _read(self) -> Set[str]:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                path = os.path.join(self.dirs.get(wd, ''), os.fsdecode(name))
+                if path in self.paths:
+                    changed.add(path)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[str] = set()
+        while not changed:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not select.select([self.fd], [], [], remaining)[0]:
+                return changed
+            changed |= self._read()
+        # Collect the rest of the burst
+        while select.select([self.fd], [], [], DEBOUNCE)[0]:
+            changed |= self._read()
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(paths: Iterable[str], poll: bool = False, interval: float = POLL_INTERVAL):
+    """inotify when available, polling otherwise."""
+    paths = list(paths)
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, interval)
+
+
+def diff_flat(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """(changed or added keys, removed keys) between two flat themes."""
+    changed = [key for key, value in new.items() if old.get(key, _MISSING) != value]
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+
+def affected_components(components_map: Dict[str, str], keys: Sequence[str]) -> Dict[str, str]:
+    """The components_map entries whose prefix covers at least one of `keys`."""
+    return {
+        name: prefix for name, prefix in components_map.items()
+        if any(key.startswith(prefix) for key in keys)
+    }
+
+
+class IncrementalRunner:
+    """Pipeline state kept between edits, with rebuilds limited to what changed."""
+
+    def __init__(self, pipeline: Pipeline, steps: Sequence[str]):
+        self.pipeline = pipeline
+        self.steps = list(steps)
+        self.fix_steps = [step for step in self.steps if step in PASS_STEPS]
+        self.own_writes: Dict[str, Optional[Tuple[int, int, int]]] = {}
+
+        pipeline.run(self.steps, write=False)
+        self._write()
+        self.theme = pipeline.theme if self._uses_theme() else None
+        self.components = self._components_snapshot()
+
+    def _uses_theme(self) -> bool:
+        return 'import' in self.steps or 'convert' in self.steps
+
+    def _components_snapshot(self) -> Optional[Dict]:
+        if not (self.fix_steps or 'import' in self.steps):
+            return None
+        return copy.deepcopy(self.pipeline.clara.get('components', {}))
+
+    def _write(self, convert: bool = True) -> List[str]:
+        """Write through the pipeline; the W3C output only when `convert`."""
+        pipeline = self.pipeline
+        w3c_tokens = pipeline.w3c_tokens
+        if not convert:
+            pipeline.w3c_tokens = None
+        try:
+            written = pipeline.write()
+        finally:
+            pipeline.w3c_tokens = w3c_tokens
+        for path in written:
+            self.own_writes[os.path.abspath(path)] = file_signature(path)
+        return written
+
+    def watched_files(self) -> List[str]:
+        files = []
+        if self._uses_theme():
+            files.append(self.pipeline.theme_file)
+        if self.fix_steps or 'import' in self.steps:
+            files.append(self.pipeline.clara_file)
+        return files
+
+    def is_own_write(self, path: str) -> bool:
+        return self.own_writes.get(os.path.abspath(path), _MISSING) == file_signature(path)
+
+    def _fix(self, names: Iterable[str]) -> Dict[str, int]:
+        components = self.pipeline.clara.get('components', {})
+        subset = {name: components[name] for name in names if name in components}
+        passes = [self.pipeline.make_pass(step) for step in self.fix_steps]
+        run_passes(subset, passes)
+        fixes = {}
+        for step, token_pass in zip(self.fix_steps, passes):
+            fixes[step] = len(token_pass.unconverted) if step == 'check' else token_pass.fixes
+            if step != 'check' and token_pass.fixes:
+                self.pipeline.clara_dirty = True
+        return fixes
+
+    def theme_changed(self) -> Dict[str, Any]:
+        pipeline = self.pipeline
+        theme = pipeline.metrics.read_json(pipeline.theme_file)
+        changed, removed = diff_flat(self.theme, theme)
+        pipeline._theme = theme
+        pipeline.value_index = None
+        self.theme = theme
+        report: Dict[str, Any] = {'changed': len(changed), 'removed': len(removed)}
+
+        if 'import' in self.steps:
+            affected = affected_components(pipeline.components_map, changed + removed)
+            if affected:
+                import_components(pipeline.clara, theme, affected, pipeline.alias_index())
+                pipeline.clara_dirty = True
+                report['components'] = list(affected)
+                report.update(self._fix(affected))
+
+        convert = 'convert' in self.steps and bool(changed or removed)
+        if convert:
+            w3c_tokens = pipeline.w3c_tokens
+            for flat_key in removed:
+                remove_nested_value(w3c_tokens, flat_key.split('.'))
+            for flat_key in changed:
+                set_nested_value(w3c_tokens, flat_key.split('.'), theme[flat_key], flat_key)
+
+        if pipeline.clara_dirty:
+            self.components = self._components_snapshot()
+        report['written'] = self._write(convert)
+        return report
+
+    def clara_changed(self) -> Dict[str, Any]:
+        pipeline = self.pipeline
+        pipeline._clara = None
+        pipeline.value_index = None
+        components = pipeline.clara.get('components', {})
+        names = [
+            name for name, component in components.items()
+            if self.components.get(name, _MISSING) != component
+        ]
+        report: Dict[str, Any] = {'components': names}
+        if names and self.fix_steps:
+            report.update(self._fix(names))
+        self.components = self._components_snapshot()
+        report['written'] = self._write(convert=False)
+        return report
+
+    def handle(self, paths: Iterable[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Rebuild for the changed `paths`; return [(path, report)]."""
+        results = []
+        theme_file = os.path.abspath(self.pipeline.theme_file)
+        # clara-tokens.json first: its edits are reloaded before the theme's
+        # components are imported into it
+        for path in sorted((os.path.abspath(p) for p in paths), key=lambda p: p == theme_file):
+            if self.is_own_write(path) or file_signature(path) is None:
+                continue
+            start = time.perf_counter()
+            try:
+                report = self.theme_changed() if path == theme_file else self.clara_changed()
+            except ValueError as error:
+                # Caught mid-save or invalid JSON: wait for the next write
+                report = {'error': str(error)}
+            report['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            results.append((path, report))
+        return results
+
+
+def watch(pipeline: Pipeline, steps: Sequence[str], poll: bool = False, interval: float = POLL_INTERVAL) -> None:
+    """Full build, then rebuild on every change until interrupted."""
+    runner = IncrementalRunner(pipeline, steps)
+    watcher = make_watcher(runner.watched_files(), poll, interval)
+    kind = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+    print(f"👀 Watching {', '.join(runner.watched_files())} ({kind}), Ctrl+C to stop")
+    try:
+        while True:
+            for path, report in runner.handle(watcher.wait()):
+                name = os.path.basename(path)
+                if 'error' in report:
+                    print(f"⚠️  {name}: {report['error']}")
+                    continue
+                details = ', '.join(
+                    f"{key} {value if not isinstance(value, list) else len(value)}"
+                    for key, value in report.items() if key not in ('ms', 'written')
+                )
+                print(f"🔄 {name}: {details} in {report['ms']:.1f} ms → {', '.join(report['written']) or 'no writes'}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
@@ -0,0 +1,29 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+JSON_DEV = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, JSON_DEV)
+
+THEME_FILE = os.path.join(JSON_DEV, 'theme-mooneygo.json')
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    """A scratch directory with a copy of the real flat theme and an empty clara-tokens.json."""
+    shutil.copy(THEME_FILE, tmp_path / 'theme-mooneygo.json')
+    write_json(tmp_path / 'clara-tokens.json', {'components': {}})
+    return tmp_path
@@ -0,0 +1,36 @@
+import os
+
+from conftest import JSON_DEV, THEME_FILE, read_json
+
+from orbit_tokens.artifact import TokenArtifact, build_artifact, load_trees
+from orbit_tokens.brands import BrandTable
+
+AUDIT_FILES = [os.path.join(JSON_DEV, '..', name) for name in ('orbit-audit.json', 'orbit-audit-semantic.json')]
+
+
+def test_lookups_match_brand_table(tmp_path):
+    trees, flat_theme = load_trees(AUDIT_FILES[:1])
+    assert flat_theme is None
+    build_artifact(trees, str(tmp_path / 'tokens.otk'))
+
+    table = BrandTable.from_trees(*trees)
+    resolved = table.resolve()
+    with TokenArtifact(str(tmp_path / 'tokens.otk')) as artifact:
+        assert len(artifact) == len(table.paths)
+        assert artifact.brands == table.brands
+        for i, path in enumerate(table.paths):
+            assert artifact.type(path) == table.types[i]
+            for brand in table.brands:
+                assert artifact.get(path, brand) == resolved[brand][i]
+        assert 'no.such.token' not in artifact
+
+
+def test_flat_theme_names_are_resolved(tmp_path):
+    trees, flat_theme = load_trees([THEME_FILE])
+    build_artifact(trees, str(tmp_path / 'theme.otk'), flat_theme=flat_theme)
+
+    theme = read_json(THEME_FILE)
+    assert theme['UIButton.roles.primary.backgroundColor'] == 'MOONEYGO_PRIMARY_3'
+    with TokenArtifact(str(tmp_path / 'theme.otk')) as artifact:
+        assert artifact.brands == ['default']
+        assert artifact.get('UIButton.roles.primary.backgroundColor') == theme['colors.MOONEYGO_PRIMARY_3']
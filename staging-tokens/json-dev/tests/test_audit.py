@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import JSON_DEV
+
+from orbit_tokens.audit import ColorTable, load_colors, near_duplicates, pairwise_delta_e, to_lab
+
+AUDIT_FILES = [os.path.join(JSON_DEV, '..', name) for name in ('orbit-audit.json', 'orbit-audit-semantic.json')]
+
+
+def _pairs(results):
+    return sorted((item['brand'], tuple(item['colors']), item['delta_e']) for item in results)
+
+
+def test_near_duplicates_do_not_depend_on_the_block_size():
+    colors = load_colors(AUDIT_FILES[:1])
+    results = near_duplicates(colors, 2.0)
+    assert results
+    assert _pairs(near_duplicates(colors, 2.0, block=7)) == _pairs(results)
+
+
+def test_near_duplicates_match_the_full_matrix():
+    values = ['#000000', '#010101', '#020202', '#FF0000', '#FE0101', '#0000FF', '#000000']
+    paths = [f'colors.c{i}' for i in range(len(values))]
+    colors = ColorTable(paths, ['default'], {'default': values}, (True for _ in paths))
+
+    results = near_duplicates(colors, 2.0, block=2)
+    rgba = np.unique(colors.rgba[:, 0], axis=0)
+    distances = pairwise_delta_e(to_lab(rgba), to_lab(rgba))
+    expected = int(np.triu(distances < 2.0, k=1).sum())
+    assert len(results) == expected
+    black = next(item for item in results if item['colors'][0] == '#000000')
+    assert black['tokens'][0] == ['colors.c0', 'colors.c6']
+
+
+def test_files_defining_the_same_paths_are_rejected():
+    with pytest.raises(ValueError, match='more than one file'):
+        load_colors(AUDIT_FILES)
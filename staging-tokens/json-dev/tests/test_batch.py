@@ -0,0 +1,44 @@
+import pytest
+
+from conftest import JSON_DEV, read_json, write_json
+
+from orbit_tokens.batch import SKIPPED, batch_convert, find_themes, print_summary
+from orbit_tokens.w3c import convert_flat_to_w3c
+
+
+def test_batch_skips_w3c_files_and_reports_errors(tmp_path):
+    flat = {'colors.WHITE': '#ffffff', 'spacings.XS': 4}
+    write_json(tmp_path / 'theme-a.json', flat)
+    write_json(tmp_path / 'tokens.json', read_json(f'{JSON_DEV}/template-w3c-linked.json'))
+    (tmp_path / 'broken.json').write_text('{"a.b": ', encoding='utf-8')
+
+    results = batch_convert(find_themes(str(tmp_path)), workers=1)
+    errors = {path.rsplit('/', 1)[-1]: error for path, _, _, _, error in results}
+
+    assert errors['theme-a.json'] is None
+    assert errors['tokens.json'] == SKIPPED
+    assert errors['broken.json'].startswith('JSONDecodeError')
+    assert read_json(tmp_path / 'theme-a-w3c.json') == convert_flat_to_w3c(flat)
+    assert not (tmp_path / 'tokens-w3c.json').exists()
+
+
+def test_batch_rejects_shared_outputs_before_converting(tmp_path):
+    write_json(tmp_path / 'theme.json', {'colors.WHITE': '#ffffff'})
+    write_json(tmp_path / 'theme.overlay.json', {'$base': 'theme.json', '$set': {}})
+
+    with pytest.raises(ValueError, match='same output'):
+        batch_convert(find_themes(str(tmp_path)), workers=2)
+    assert not (tmp_path / 'theme-w3c.json').exists()
+
+
+def test_batch_leaves_unchanged_outputs_untouched(tmp_path, capsys):
+    write_json(tmp_path / 'theme-a.json', {'colors.WHITE': '#ffffff'})
+    [(_, _, size, _, _)] = batch_convert(find_themes(str(tmp_path)), workers=1)
+    assert size > 0
+    written = (tmp_path / 'theme-a-w3c.json').stat().st_mtime_ns
+
+    results = batch_convert(find_themes(str(tmp_path)), workers=1)
+    assert results[0][2] == 0
+    assert (tmp_path / 'theme-a-w3c.json').stat().st_mtime_ns == written
+    print_summary(results, 0.0)
+    assert '1 unchanged' in capsys.readouterr().out
@@ -0,0 +1,40 @@
+from orbit_tokens.brands import BrandTable
+
+
+def brand_token(**values):
+    return {'$value': values, '$type': 'color'}
+
+
+def resolve(tree):
+    table = BrandTable.from_trees(tree)
+    resolved = table.resolve()
+    return {brand: table.brand_tokens(brand, resolved) for brand in table.brands}
+
+
+def test_brand_maps_resolve_per_brand():
+    tree = {'global': {'red': {'$value': '#f00', '$type': 'color'}, 'blue': {'$value': '#00f', '$type': 'color'}},
+            'semantic': {'primary': brand_token(x='{global.red}', y='{global.blue}'),
+                         'action': {'$value': '{semantic.primary}', '$type': 'color'}}}
+    values = resolve(tree)
+    assert values['x']['semantic.action'] == '#f00'
+    assert values['y']['semantic.action'] == '#00f'
+
+
+def test_union_cycle_that_is_acyclic_per_brand_resolves_for_dependents():
+    # x: a → b → red; y: b → a → #111. The union graph has a ↔ b, no brand does.
+    tree = {'s': {'red': {'$value': '#f00', '$type': 'color'},
+                  'a': brand_token(x='{s.b}', y='#111'),
+                  'b': brand_token(x='{s.red}', y='{s.a}'),
+                  'd': {'$value': '{s.a}', '$type': 'color'}}}
+    values = resolve(tree)
+    assert values['x']['s.a'] == values['x']['s.d'] == '#f00'
+    assert values['y']['s.b'] == values['y']['s.d'] == '#111'
+
+
+def test_cycle_within_a_brand_resolves_to_none():
+    tree = {'s': {'a': brand_token(x='{s.b}', y='#111'),
+                  'b': brand_token(x='{s.a}', y='#222'),
+                  'd': {'$value': '{s.a}', '$type': 'color'}}}
+    values = resolve(tree)
+    assert values['x']['s.a'] is None and values['x']['s.d'] is None
+    assert values['y']['s.d'] == '#111'
@@ -0,0 +1,86 @@
+import json
+
+from conftest import THEME_FILE, read_json, write_json
+
+from orbit_tokens.incremental import convert_incremental, save_manifest
+from orbit_tokens.stream import stream_convert
+from orbit_tokens.synthetic import generate_flat_theme
+from orbit_tokens.w3c import convert_flat_to_w3c
+
+
+def dump(tokens):
+    return json.dumps(tokens, indent=2, ensure_ascii=False)
+
+
+def test_stream_matches_in_memory_conversion(tmp_path):
+    output = tmp_path / 'out.json'
+    count, written = stream_convert(THEME_FILE, str(output))
+    assert written
+    flat = read_json(THEME_FILE)
+    assert count == len(flat)
+    assert output.read_text(encoding='utf-8') == dump(convert_flat_to_w3c(flat))
+
+
+def test_stream_handles_ungrouped_keys(tmp_path):
+    # Keys of one group interleaved with another force the external sort
+    flat = generate_flat_theme(500, seed=3)
+    shuffled = dict(sorted(flat.items(), key=lambda item: item[0][::-1]))
+    source = tmp_path / 'flat.json'
+    write_json(source, shuffled)
+    stream_convert(str(source), str(tmp_path / 'out.json'), chunk_rows=64)
+    assert read_json(tmp_path / 'out.json') == convert_flat_to_w3c(shuffled)
+
+
+def test_incremental_matches_in_memory_conversion(tmp_path):
+    output = tmp_path / 'out.json'
+    flat = generate_flat_theme(800, seed=1)
+
+    tokens, snapshot, stats = convert_incremental(flat, str(output))
+    assert stats['full'] == 1
+    write_json(output, tokens)
+    save_manifest(f'{output}.manifest.json', snapshot)
+    assert convert_incremental(flat, str(output))[0] is None
+
+    keys = list(flat)
+    edited = dict(flat)
+    del edited[keys[10]]
+    edited[keys[20]] = '#123456'
+    edited['UINewComponent.roles.primary.height'] = 42
+
+    tokens, snapshot, stats = convert_incremental(edited, str(output))
+    assert (stats['full'], stats['added'], stats['changed'], stats['removed']) == (0, 1, 1, 1)
+    assert dump(tokens) == dump(convert_flat_to_w3c(edited))
+
+
+def test_incremental_tells_booleans_from_numbers(tmp_path):
+    output = tmp_path / 'out.json'
+    flat = {'UIButton.roles.primary.enabled': 1, 'UIButton.roles.primary.height': 40}
+    tokens, snapshot, _ = convert_incremental(flat, str(output))
+    write_json(output, tokens)
+    save_manifest(f'{output}.manifest.json', snapshot)
+
+    edited = dict(flat, **{'UIButton.roles.primary.enabled': True})
+    tokens, _, stats = convert_incremental(edited, str(output))
+    assert stats['changed'] == 1
+    assert tokens == convert_flat_to_w3c(edited)
+
+
+def test_unchanged_manifest_is_not_rewritten(tmp_path):
+    manifest = tmp_path / 'out.json.manifest.json'
+    _, snapshot, _ = convert_incremental(generate_flat_theme(50, seed=2), str(tmp_path / 'out.json'))
+
+    assert save_manifest(str(manifest), snapshot) > 0
+    written = manifest.stat().st_mtime_ns
+    assert save_manifest(str(manifest), snapshot) == 0
+    assert manifest.stat().st_mtime_ns == written
+    assert read_json(manifest)['types'] == [snapshot['types'][key] for key in snapshot['values']]
+
+
+def test_stream_leaves_an_unchanged_output_untouched(tmp_path):
+    output = tmp_path / 'out.json'
+    stream_convert(THEME_FILE, str(output))
+    written = output.stat().st_mtime_ns
+
+    assert stream_convert(THEME_FILE, str(output)) == (len(read_json(THEME_FILE)), False)
+    assert output.stat().st_mtime_ns == written
+    assert [path.name for path in tmp_path.iterdir()] == ['out.json']
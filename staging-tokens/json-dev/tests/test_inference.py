@@ -0,0 +1,51 @@
+import pytest
+
+from conftest import write_json
+
+from orbit_tokens.incremental import convert_incremental, save_manifest
+from orbit_tokens.inference import CACHE_SIZE, TypeEngine, studio_types, w3c_types
+
+
+@pytest.mark.parametrize('value', ['#abc', '#ABCDEF', '#aabbccdd', 'rgb(1, 2, 3)', 'rgba(0,0,0,.5)'])
+def test_color_values(value):
+    assert w3c_types.infer('anything', value) == 'color'
+
+
+@pytest.mark.parametrize('value', ['#abcdefabc', '#fffzzz', '#', 'red', 'rgbish'])
+def test_malformed_colors_are_not_colors(value):
+    assert w3c_types.infer('label', value) == 'string'
+
+
+def test_key_rules():
+    assert studio_types.infer('UIButton.sizes.small.borderRadius', 8) == 'borderRadius'
+    assert w3c_types.infer('UIButton.sizes.small.borderRadius', 8) == 'dimension'
+    assert w3c_types.infer('UIButton.roles.primary.backgroundColor', 'WHITE') == 'color'
+    assert w3c_types.infer('UIText.textAlign', 'center') == 'string'
+    assert studio_types.alias_type('{global.radius.md}') == 'borderRadius'
+
+
+def test_caches_are_bounded():
+    engine = TypeEngine()
+    for i in range(CACHE_SIZE + 10):
+        engine.infer(f'group{i}.item{i}.height', i)
+    assert len(engine._masks) <= CACHE_SIZE
+    assert len(engine._key_types['number']) <= CACHE_SIZE
+
+
+def test_manifest_from_other_rules_forces_a_full_rebuild(tmp_path, monkeypatch):
+    output = tmp_path / 'out.json'
+    flat = {'colors.WHITE': '#ffffff', 'UIButton.height': 40}
+    tokens, snapshot, _ = convert_incremental(flat, str(output))
+    write_json(output, tokens)
+    save_manifest(f'{output}.manifest.json', snapshot)
+    assert convert_incremental(flat, str(output))[2]['full'] == 0
+
+    monkeypatch.setattr(w3c_types, 'fingerprint', 'other-rules')
+    assert convert_incremental(flat, str(output))[2]['full'] == 1
+
+
+def test_keywords_may_be_prefixes_of_other_keywords():
+    engine = TypeEngine(key_rules=(('fontSize', ('fontsize',), None), ('typography', ('font',), None)))
+    assert engine.keywords('UIText.fontSize') == ['fontsize', 'font']
+    assert engine.infer('UIText.fontSize', 14) == 'fontSize'
+    assert engine.infer('UIText.fontFamily', 'Inter') == 'typography'
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import JSON_DEV, read_json, write_json
+
+from orbit_tokens.pipeline import Pipeline
+
+
+def run_script(name, *args, cwd):
+    env = dict(os.environ, PYTHONPATH=JSON_DEV)
+    subprocess.run([sys.executable, os.path.join(JSON_DEV, name), *args],
+                   cwd=cwd, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+GLOBAL_SET = {'colors': {
+    'brand': {'deep': {'$value': '#00587C', '$type': 'color'}},
+    'neutral': {'white': {'$value': '#FFFFFF', '$type': 'color'}},
+}}
+
+
+@pytest.mark.parametrize('sets', [{}, {'global': GLOBAL_SET}])
+def test_pipeline_matches_separate_scripts(workdir, tmp_path_factory, sets):
+    write_json(workdir / 'clara-tokens.json', dict(sets, components={}))
+    scripts_dir = tmp_path_factory.mktemp('scripts')
+    for name in ('theme-mooneygo.json', 'clara-tokens.json'):
+        (scripts_dir / name).write_bytes((workdir / name).read_bytes())
+
+    run_script('import-components-v2.py', 'theme-mooneygo.json', 'clara-tokens.json', cwd=scripts_dir)
+    run_script('fix-aliases.py', 'clara-tokens.json', cwd=scripts_dir)
+    run_script('fix-types-by-alias.py', 'clara-tokens.json', cwd=scripts_dir)
+    run_script('convert-to-w3c.py', 'theme-mooneygo.json', 'theme-mooneygo-w3c.json', cwd=scripts_dir)
+
+    pipeline = Pipeline(str(workdir / 'theme-mooneygo.json'), str(workdir / 'clara-tokens.json'),
+                        str(workdir / 'theme-mooneygo-w3c.json'))
+    report = pipeline.run(['import', 'fix-aliases', 'fix-types', 'convert'])
+
+    assert report['fix-aliases'] > 0
+    for name in ('clara-tokens.json', 'theme-mooneygo-w3c.json'):
+        assert (workdir / name).read_bytes() == (scripts_dir / name).read_bytes()
+
+
+def test_values_are_aliased_by_value(workdir):
+    write_json(workdir / 'clara-tokens.json', {'global': GLOBAL_SET, 'components': {}})
+    pipeline = Pipeline(str(workdir / 'theme-mooneygo.json'), str(workdir / 'clara-tokens.json'), None)
+    pipeline.run(['import'])
+
+    primary = read_json(workdir / 'clara-tokens.json')['components']['button']['roles']['primary']
+    # MOONEYGO_PRIMARY_3 is #00587C in the theme; ALIAS_MAP would point elsewhere
+    assert primary['backgroundColor']['$value'] == '{global.colors.brand.deep}'
+    assert primary['textColor']['$value'] == '{global.colors.neutral.white}'
+    # No match in the sets: the hand-written conversion still applies
+    assert primary['disabledTextColor']['$value'] == '{global.colors.greyscale.4}'
+
+
+def test_pipeline_skips_unchanged_writes(workdir):
+    args = (str(workdir / 'theme-mooneygo.json'), str(workdir / 'clara-tokens.json'),
+            str(workdir / 'theme-mooneygo-w3c.json'))
+    steps = ['import', 'fix-aliases', 'fix-types', 'convert']
+    first = Pipeline(*args).run(steps)
+    assert len(first['written']) == 2
+
+    second = Pipeline(*args)
+    assert second.run(steps)['written'] == []
+    assert second.metrics.counters['files_unchanged'] == 2
+
+
+def test_pipeline_dry_run_writes_nothing(workdir):
+    before = (workdir / 'clara-tokens.json').read_bytes()
+    pipeline = Pipeline(str(workdir / 'theme-mooneygo.json'), str(workdir / 'clara-tokens.json'),
+                        str(workdir / 'theme-mooneygo-w3c.json'))
+    pipeline.run(['import', 'fix-aliases'], write=False)
+    assert (workdir / 'clara-tokens.json').read_bytes() == before
+    assert not (workdir / 'theme-mooneygo-w3c.json').exists()
+    assert read_json(workdir / 'clara-tokens.json') == {'components': {}}
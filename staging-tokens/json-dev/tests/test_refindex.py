@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from conftest import read_json, write_json
+
+from orbit_tokens import refindex
+from orbit_tokens.refindex import RefIndex, open_index
+
+BASE = {'global': {'red': {'$value': '#FF0000'}, 'blue': {'$value': '#0000FF'}}}
+LINKED = {'s': {
+    'x': {'$value': '{global.red}'},
+    'y': {'$value': '{s.x}'},
+    'z': {'$value': '{red}'},
+    'w': {'$value': '1px solid {s.y}'},
+}}
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_json(tmp_path / 'a.json', BASE)
+    write_json(tmp_path / 'b.json', LINKED)
+    return tmp_path
+
+
+def rewrite(path, data):
+    """Write `data` with a new mtime, so the stat signature always changes."""
+    mtime = os.stat(path).st_mtime_ns
+    write_json(path, data)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def paths(deps):
+    return sorted((path, depth) for _, path, depth in deps)
+
+
+def test_query_keeps_the_indexed_files(files, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['refindex', 'update', 'a.json', 'b.json'])
+    refindex.main()
+    monkeypatch.setattr('sys.argv', ['refindex', 'query', 'global.red'])
+    refindex.main()
+
+    assert 'global.red → global.red: 4 dependents' in capsys.readouterr().out
+    assert sorted(read_json(files / refindex.DEFAULT_INDEX)['files']) == ['a.json', 'b.json']
+
+
+def test_query_refreshes_changed_files(files):
+    index = RefIndex('refs.json')
+    index.update(['a.json', 'b.json'])
+    index.save()
+
+    rewrite(files / 'b.json', {'s': {'x': {'$value': '{global.blue}'}, **{k: v for k, v in LINKED['s'].items() if k != 'x'}}})
+    index = open_index(index_file='refs.json')
+    assert paths(index.dependents('global.blue')) == [('s.w', 3), ('s.x', 1), ('s.y', 2)]
+    assert paths(index.dependents('global.red')) == [('s.z', 1)]
+
+
+def test_edge_change_patches_the_reverse_map(files, monkeypatch):
+    index = RefIndex('refs.json')
+    index.update(['a.json', 'b.json'])
+
+    changed = {'s': dict(LINKED['s'], z={'$value': '{blue}'})}
+    rewrite(files / 'b.json', changed)
+    monkeypatch.setattr(index, 'rebuild', lambda: pytest.fail('same paths must not rebuild'))
+    assert index.update(['a.json', 'b.json']) == ['b.json']
+
+    assert paths(index.dependents('global.red')) == [('s.w', 3), ('s.x', 1), ('s.y', 2)]
+    assert paths(index.dependents('{global.blue}')) == [('s.z', 1)]
+
+
+def test_new_paths_rebuild_relative_references(files):
+    index = RefIndex('refs.json')
+    index.update(['a.json', 'b.json'])
+    assert index.target('red') == 'global.red'
+
+    # global.red moves to palette.red: the relative {red} now designates it
+    rewrite(files / 'a.json', {'palette': {'red': {'$value': '#FF0000'}}, 'global': {'blue': {'$value': '#0000FF'}}})
+    rebuilds = []
+    rebuild = index.rebuild
+    index.rebuild = lambda: rebuilds.append(1) or rebuild()
+    assert index.update(['a.json', 'b.json']) == ['a.json']
+
+    assert rebuilds == [1]
+    assert index.target('red') == 'palette.red'
+    assert paths(index.dependents('palette.red')) == [('s.z', 1)]
+    assert paths(index.dependents('global.red')) == [('s.w', 3), ('s.x', 1), ('s.y', 2)]
+
+
+def test_transitive_depth(files):
+    index = open_index(['a.json', 'b.json'], index_file='refs.json')
+    assert paths(index.dependents('global.red')) == [('s.w', 3), ('s.x', 1), ('s.y', 2), ('s.z', 1)]
+    assert paths(index.dependents('global.red', transitive=False)) == [('s.x', 1), ('s.z', 1)]
+    assert paths(index.dependents('s.y')) == [('s.w', 1)]
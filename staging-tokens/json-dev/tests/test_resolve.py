@@ -0,0 +1,73 @@
+from orbit_tokens.resolve import TokenGraph, resolve_tokens
+
+
+def token(value, token_type='color'):
+    return {'$value': value, '$type': token_type}
+
+
+def test_chains_resolve_to_literals():
+    tree = {'global': {'red': token('#f00'), 'primary': token('{global.red}')},
+            'semantic': {'action': token('{global.primary}'), 'border': token('1px solid {global.red}', 'border')}}
+    result = resolve_tokens(tree)
+    assert result.ok
+    assert result.values['semantic.action'] == '#f00'
+    assert result.values['semantic.border'] == '1px solid #f00'
+
+
+def test_relative_references_resolve_within_sets():
+    tree = {'global': {'colors': {'coffee': {'70': token('#6f4e37')}}},
+            'semantic': {'brand': token('{colors.coffee.70}')}}
+    result = resolve_tokens(tree)
+    assert result.ok
+    assert result.values['semantic.brand'] == '#6f4e37'
+
+
+def test_full_paths_win_over_relative_ones():
+    tree = {'colors': {'red': token('#full')},
+            'global': {'colors': {'red': token('#relative')}},
+            'semantic': {'x': token('{colors.red}')}}
+    assert resolve_tokens(tree).values['semantic.x'] == '#full'
+
+
+def test_dangling_references_are_reported_and_left_untouched():
+    tree = {'global': {'x': token('{global.missing}'), 'y': token('{global.x}')}}
+    result = resolve_tokens(tree)
+    assert result.dangling == {'global.x': ['global.missing']}
+    assert result.values['global.x'] == '{global.missing}'
+    assert result.values['global.y'] == '{global.missing}'
+
+
+def test_cycles_are_reported_and_excluded():
+    tree = {'global': {'a': token('{global.b}'), 'b': token('{global.a}'), 'c': token('#fff')}}
+    result = resolve_tokens(tree)
+    assert not result.ok
+    assert sorted(result.cycles[0]) == ['global.a', 'global.b']
+    assert 'global.a' not in result.values
+    assert result.values['global.c'] == '#fff'
+
+
+def test_topological_order_puts_targets_first():
+    tree = {'s': {'a': token('{s.b}'), 'b': token('{s.c}'), 'c': token('#000')}}
+    order, cycles = TokenGraph.from_trees(tree).topological_order()
+    assert cycles == []
+    assert order.index('s.c') < order.index('s.b') < order.index('s.a')
+
+
+def test_paths_defined_by_several_trees_are_reported():
+    first = {'semantic': {'a': token('#111'), 'b': token('#222')}}
+    second = {'semantic': {'a': token('#333')}}
+    result = resolve_tokens(first, second)
+    assert result.collisions == {'semantic.a': [0, 1]}
+    assert not result.ok
+    assert result.values['semantic.a'] == '#333'
+    assert resolve_tokens(first).collisions == {}
+
+
+def test_tokens_depending_on_a_cycle_are_blocked():
+    tree = {'s': {'a': token('{s.b}'), 'b': token('{s.c}'), 'c': token('{s.b}'),
+                  'd': token('1px solid {s.a}', 'border'), 'e': token('#fff')}}
+    result = resolve_tokens(tree)
+    assert not result.ok
+    assert result.blocked == {'s.a': ['s.b'], 's.d': ['s.a']}
+    assert set(result.values) == {'s.e'}
+    assert tree['s']['d']['$value'] == '1px solid {s.a}'
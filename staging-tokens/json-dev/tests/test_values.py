@@ -0,0 +1,53 @@
+import pytest
+
+from orbit_tokens.values import ValueIndex, canonical_value, is_theme_name
+
+
+def token(value, token_type):
+    return {'$value': value, '$type': token_type}
+
+
+@pytest.fixture
+def index():
+    tokens = {
+        'global': {
+            'colors': {'grey': {'3': token('#bbbbbb', 'color')}},
+            'spacing': {'none': token(0, 'dimension'), 'md': token('16px', 'dimension')},
+        },
+    }
+    index = ValueIndex.from_trees(tokens)
+    index.add_theme_names({'colors.GREYSCALE_3': '#BBBBBB', 'spacings.M': 16})
+    return index
+
+
+@pytest.mark.parametrize('value', ['#BBB', '#bbb', '#BBBBBB', '#bbbbbbff', 'rgba(187, 187, 187, 1)'])
+def test_color_spellings_find_the_same_alias(index, value):
+    assert index.alias(value, 'color') == '{global.colors.grey.3}'
+
+
+def test_theme_names_are_looked_up_in_the_flat_theme(index):
+    assert index.alias('GREYSCALE_3', 'color', 'textColor') == '{global.colors.grey.3}'
+    assert index.alias('M', 'dimension', 'paddingTop') == '{global.spacing.md}'
+
+
+def test_uppercase_hex_is_not_a_theme_name():
+    assert not is_theme_name('#FFFFFF')
+    assert not is_theme_name('#BBB')
+    assert not is_theme_name('16')
+    assert is_theme_name('GREYSCALE_3')
+
+
+@pytest.mark.parametrize('value, token_type, key', [
+    ('0', 'number', 'opacity'),
+    ('16', 'string', 'label'),
+    (16, 'fontWeight', 'fontWeight'),
+])
+def test_unitless_values_are_not_dimensions_for_other_types(index, value, token_type, key):
+    assert index.alias(value, token_type, key) is None
+
+
+def test_unitless_values_are_dimensions_for_dimension_types(index):
+    assert index.alias('16', 'dimension') == '{global.spacing.md}'
+    assert index.alias(0, 'dimension') == '{global.spacing.none}'
+    assert canonical_value('16px') == ('dimension', 16.0)
+    assert canonical_value('16') is None
@@ -0,0 +1,22 @@
+from conftest import read_json, write_json
+
+from orbit_tokens.pipeline import Pipeline
+from orbit_tokens.watch import IncrementalRunner
+
+
+def test_relative_theme_path_rebuilds_the_theme(workdir, monkeypatch):
+    monkeypatch.chdir(workdir)
+    pipeline = Pipeline('theme-mooneygo.json', 'clara-tokens.json', 'theme-mooneygo-w3c.json')
+    runner = IncrementalRunner(pipeline, ['convert'])
+    bytes_read = pipeline.metrics.counters['bytes_read']
+
+    theme = read_json(workdir / 'theme-mooneygo.json')
+    theme['colors.MOONEYGO_PRIMARY_3'] = '#123456'
+    write_json(workdir / 'theme-mooneygo.json', theme)
+
+    [(path, report)] = runner.handle(['theme-mooneygo.json'])
+    assert path == str(workdir / 'theme-mooneygo.json')
+    assert report['changed'] == 1
+    assert pipeline.metrics.counters['bytes_read'] > bytes_read
+    w3c = read_json(workdir / 'theme-mooneygo-w3c.json')
+    assert w3c['colors']['MOONEYGO_PRIMARY_3']['$value'] == '#123456'